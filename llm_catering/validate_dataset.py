@@ -5,15 +5,24 @@ from __future__ import absolute_import
 import argparse
 import json
 import math
+import os
 import sys
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+# Files smaller than two chunks of this size are validated in-process.
+_MIN_CHUNK_BYTES = 4 * 1024 * 1024
+# Large buffered reads keep syscalls per chunk low; readline() splits in memory.
+_READ_BUFFER_BYTES = 4 * 1024 * 1024
 
 
 def main(argv=None):
     if argv is None:
         argv = sys.argv[1:]
     args = _parse_args(argv)
-    result = _validate_dataset(args.input_path, include_stats=args.stats)
+    result = _validate_dataset(
+        args.input_path, include_stats=args.stats, workers=args.workers
+    )
     _print_summary(result, include_stats=args.stats)
 
 
@@ -32,31 +41,84 @@ def _parse_args(argv):
         action="store_true",
         help="Print additional dataset statistics.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for validation (default: CPU count).",
+    )
     return parser.parse_args(argv)
 
 
-def _validate_dataset(input_path, include_stats=False):
+def _validate_dataset(input_path, include_stats=False, workers=None):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    ranges = _chunk_ranges(input_path, max(int(workers), 1))
+
+    result = {
+        "total_records": 0,
+        "invalid_records": 0,
+        "failure_counts": Counter(),
+        "testview_records": 0,
+        "text_lengths": [],
+        "error_signature_counts": Counter(),
+        "component_counts": Counter(),
+    }
+    tasks = [(input_path, start, end, include_stats) for start, end in ranges]
+    if len(tasks) <= 1:
+        for task in tasks:
+            _merge_chunk_result(result, _validate_chunk(task))
+        return result
+
+    with ProcessPoolExecutor(max_workers=len(tasks)) as executor:
+        # map() yields in submission order, so record indexes stay global and
+        # the first failing record in file order is the one reported.
+        for chunk_result in executor.map(_validate_chunk, tasks):
+            _merge_chunk_result(result, chunk_result)
+    return result
+
+
+def _chunk_ranges(input_path, workers):
+    size = os.stat(input_path).st_size
+    if workers <= 1 or size < _MIN_CHUNK_BYTES * 2:
+        return [(0, size)]
+    chunk_count = min(workers, size // _MIN_CHUNK_BYTES)
+    step = int(math.ceil(size / float(chunk_count)))
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def _validate_chunk(task):
+    """Validate the records whose first byte falls in [start, end)."""
+    input_path, start, end, include_stats = task
     total_records = 0
     failure_counts = Counter()
     testview_records = 0
     text_lengths = []
     error_signature_counts = Counter()
     component_counts = Counter()
-
-    with open(input_path, "r") as infile:
-        for line in infile:
-            line = line.strip()
+    first_error = None
+
+    with open(input_path, "rb", buffering=_READ_BUFFER_BYTES) as infile:
+        _advise_sequential(infile, start, end)
+        position = start
+        if start > 0:
+            # Resume after the newline that ends the record straddling start.
+            infile.seek(start - 1)
+            position = start - 1 + len(infile.readline())
+        while position < end:
+            raw_line = infile.readline()
+            if not raw_line:
+                break
+            position += len(raw_line)
+            line = raw_line.decode("utf-8").strip()
             if not line:
                 continue
             total_records += 1
             try:
                 record = json.loads(line)
             except ValueError:
-                raise ValueError(
-                    "record {index} failed contract validation: invalid json".format(
-                        index=total_records
-                    )
-                )
+                first_error = (total_records, None, ["invalid json"])
+                break
 
             errors = _validate_record(record)
             if errors:
@@ -65,16 +127,8 @@ def _validate_dataset(input_path, include_stats=False):
                 identifier = None
                 if isinstance(record, dict):
                     identifier = record.get("id")
-                label = "record {index}".format(index=total_records)
-                if identifier is not None:
-                    label = "{label} (id={identifier})".format(
-                        label=label, identifier=identifier
-                    )
-                raise ValueError(
-                    "{label} failed contract validation: {errors}".format(
-                        label=label, errors="; ".join(errors)
-                    )
-                )
+                first_error = (total_records, identifier, errors)
+                break
 
             if include_stats and isinstance(record, dict):
                 if _has_testview(record):
@@ -84,15 +138,51 @@ def _validate_dataset(input_path, include_stats=False):
 
     return {
         "total_records": total_records,
-        "invalid_records": 0,
         "failure_counts": failure_counts,
         "testview_records": testview_records,
         "text_lengths": text_lengths,
         "error_signature_counts": error_signature_counts,
         "component_counts": component_counts,
+        "first_error": first_error,
     }
 
 
+def _advise_sequential(infile, start, end):
+    """Ask the kernel for aggressive readahead so I/O overlaps with parsing."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        os.posix_fadvise(
+            infile.fileno(), start, end - start, os.POSIX_FADV_SEQUENTIAL
+        )
+    except OSError:
+        pass
+
+
+def _merge_chunk_result(result, chunk_result):
+    first_error = chunk_result["first_error"]
+    if first_error is not None:
+        local_index, identifier, errors = first_error
+        result["failure_counts"].update(chunk_result["failure_counts"])
+        label = "record {index}".format(index=result["total_records"] + local_index)
+        if identifier is not None:
+            label = "{label} (id={identifier})".format(
+                label=label, identifier=identifier
+            )
+        raise ValueError(
+            "{label} failed contract validation: {errors}".format(
+                label=label, errors="; ".join(errors)
+            )
+        )
+
+    result["total_records"] += chunk_result["total_records"]
+    result["failure_counts"].update(chunk_result["failure_counts"])
+    result["testview_records"] += chunk_result["testview_records"]
+    result["text_lengths"].extend(chunk_result["text_lengths"])
+    result["error_signature_counts"].update(chunk_result["error_signature_counts"])
+    result["component_counts"].update(chunk_result["component_counts"])
+
+
 def _print_summary(result, include_stats=False):
     print("total_records: {total}".format(total=result["total_records"]))
     print("invalid_records: {invalid}".format(invalid=result["invalid_records"]))
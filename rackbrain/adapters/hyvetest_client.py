@@ -1,13 +1,96 @@
 # rackbrain/adapters/hyvetest_client.py
 
 import logging
-from typing import Any, Dict, Optional
+import queue
+from typing import Any, Dict, List, Optional
 
 import pymysql
 from database_config import host as DB_HOST, user as DB_USER, passwd as DB_PASS, db as DB_NAME
 
+# Idle connections kept for reuse; extra connections opened under load are
+# closed on release instead of blocking callers.
+_POOL_MAX_IDLE = 16
+_POOL: "queue.LifoQueue" = queue.LifoQueue(maxsize=_POOL_MAX_IDLE)
 
-def fetch_server_details_from_db(sn: str) -> Optional[Dict[str, Any]]:
+
+class HyvetestLookupError(RuntimeError):
+    """Raised (with raise_errors=True) when the DB lookup itself failed."""
+
+
+# Upper bound on SNs per IN (...) query in fetch_server_details_bulk.
+_BULK_CHUNK_SIZE = 500
+
+# Column aliases are the result dict keys (rows come back via DictCursor).
+_SERVER_DETAILS_SQL = """
+        SELECT 
+            Server.sn_tag AS sn, 
+            ServerStatus.id AS server_status_id, 
+            ServerStatus.ok AS server_ok, 
+            Server.position AS pos, 
+            Rack.sn_tag AS rack_sn, 
+            ServerStatus.states -> '$.sfcs.model' AS model, 
+            ServerStatus.states -> '$.sfcs.customerIpn' AS customer_ipn, 
+            ServerStatus.states -> '$.meta."rack_sn"' AS test_rack_sn, 
+            ServerStatus.states -> '$.meta."code_version"' AS tm2_ver, 
+            ServerStatus.states -> '$.operation_records[0]."user_email"' AS tester_email, 
+            ServerStatus.started AS started, 
+            ServerStatus.finished AS finished, 
+            servererror.detail AS server_error_detail, 
+            JSON_UNQUOTE(ServerStatus.states -> '$.jar_deliver."testErrorCode"') AS failed_testcase, 
+            JSON_UNQUOTE(ServerStatus.states -> '$.jar_deliver."associatedTestSetName"') AS failed_testset, 
+            JSON_UNQUOTE(ServerStatus.states -> '$.jar_deliver."failureMessage"') AS failure_message, 
+            ServerStatus.states -> '$.jar_deliver.associatedTestSetGuti' AS guti
+        FROM Server 
+        JOIN ServerStatus ON Server.serverstatus_id = ServerStatus.id 
+        LEFT JOIN servererror ON ServerStatus.id = servererror.serverstatus_id 
+        LEFT JOIN Rack ON Server.rack_id = Rack.id 
+        WHERE Server.sn_tag IN ({placeholders})
+        """
+
+
+def _acquire_conn():
+    """
+    Take an idle pooled connection (re-validated with ping) or open a new one.
+    """
+    while True:
+        try:
+            conn = _POOL.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            conn.ping(reconnect=True)
+            return conn
+        except pymysql.MySQLError:
+            _close_quietly(conn)
+
+    return pymysql.connect(
+        host=DB_HOST,
+        user=DB_USER,
+        password=DB_PASS,
+        database=DB_NAME,
+        charset="utf8mb4",
+        # Long-lived connections must not pin a REPEATABLE READ snapshot.
+        autocommit=True,
+    )
+
+
+def _release_conn(conn) -> None:
+    if not getattr(conn, "open", False):
+        return
+    try:
+        _POOL.put_nowait(conn)
+    except queue.Full:
+        _close_quietly(conn)
+
+
+def _close_quietly(conn) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+def fetch_server_details_from_db(sn: str, *, raise_errors: bool = False) -> Optional[Dict[str, Any]]:
     """
     Look up SLT context for a server SN in hyvetest (EVE DB).
 
@@ -16,10 +99,39 @@ def fetch_server_details_from_db(sn: str) -> Optional[Dict[str, Any]]:
       test_rack_sn, tm2_ver, tester_email, started, finished,
       server_error_detail, failed_testcase, failed_testset,
       failure_message, guti
-    or None if not found / error.
+    or None if not found / error. With raise_errors=True, errors raise
+    HyvetestLookupError instead, so None always means "not found".
+    """
+    return fetch_server_details_bulk([sn], raise_errors=raise_errors).get(sn)
+
+
+def fetch_server_details_bulk(
+    sns: List[str], *, raise_errors: bool = False
+) -> Dict[str, Dict[str, Any]]:
     """
+    Look up SLT context for many server SNs with one IN (...) query per
+    chunk instead of one round-trip per SN.
+
+    Returns {sn: details} (same dict shape as fetch_server_details_from_db),
+    keyed by the SN strings passed in. SNs that are not found are absent;
+    on DB errors (or missing DB settings) an empty (or partial) dict is
+    returned, or HyvetestLookupError raised when raise_errors=True.
+    """
+    # sn_tag compares case-insensitively in MySQL; map rows back to the
+    # caller's spelling of each SN.
+    requested: Dict[str, str] = {}
+    for sn in sns:
+        if sn:
+            requested.setdefault(str(sn).lower(), sn)
+    results: Dict[str, Dict[str, Any]] = {}
+    if not requested:
+        return results
+
     conn = None
     cursor = None
+    # Only a connection that finished every query goes back to the pool;
+    # after any exception it may be mid-result or broken, so it is closed.
+    conn_ok = False
     try:
         if not (DB_HOST and DB_USER and DB_PASS and DB_NAME):
             missing = []
@@ -31,84 +143,50 @@ def fetch_server_details_from_db(sn: str) -> Optional[Dict[str, Any]]:
                 missing.append("RACKBRAIN_DB_PASS")
             if not DB_NAME:
                 missing.append("RACKBRAIN_DB_NAME")
-            print(
-                "[INFO] DB lookup skipped: missing env var(s): %s"
-                % (", ".join(missing) if missing else "unknown")
+            msg = "DB lookup skipped: missing env var(s): %s" % (
+                ", ".join(missing) if missing else "unknown"
             )
-            return None
-
-        conn = pymysql.connect(
-            host=DB_HOST,
-            user=DB_USER,
-            password=DB_PASS,
-            database=DB_NAME,
-            charset="utf8mb4",
-        )
-        cursor = conn.cursor()
-
-        query = """
-        SELECT 
-            Server.sn_tag AS sn, 
-            ServerStatus.id AS ssid, 
-            ServerStatus.ok AS ss_ok, 
-            Server.position AS pos, 
-            Rack.sn_tag AS rack_sn, 
-            ServerStatus.states -> '$.sfcs.model' AS model, 
-            ServerStatus.states -> '$.sfcs.customerIpn' AS customer_ipn, 
-            ServerStatus.states -> '$.meta."rack_sn"' AS test_rack_sn, 
-            ServerStatus.states -> '$.meta."code_version"' AS TM2_ver, 
-            ServerStatus.states -> '$.operation_records[0]."user_email"' AS tester_email, 
-            ServerStatus.started, 
-            ServerStatus.finished, 
-            servererror.detail, 
-            JSON_UNQUOTE(ServerStatus.states -> '$.jar_deliver."testErrorCode"') as Failed_Testcase, 
-            JSON_UNQUOTE(ServerStatus.states -> '$.jar_deliver."associatedTestSetName"') as Failed_Testset, 
-            JSON_UNQUOTE(ServerStatus.states -> '$.jar_deliver."failureMessage"') as failure_Message, 
-            ServerStatus.states -> '$.jar_deliver.associatedTestSetGuti' AS guti
-        FROM Server 
-        JOIN ServerStatus ON Server.serverstatus_id = ServerStatus.id 
-        LEFT JOIN servererror ON ServerStatus.id = servererror.serverstatus_id 
-        LEFT JOIN Rack ON Server.rack_id = Rack.id 
-        WHERE Server.sn_tag = %s
-        """
+            if raise_errors:
+                raise HyvetestLookupError(msg)
+            print(f"[INFO] {msg}")
+            return results
+
+        conn = _acquire_conn()
+        cursor = conn.cursor(pymysql.cursors.DictCursor)
+
+        wanted = list(requested.values())
+        for start in range(0, len(wanted), _BULK_CHUNK_SIZE):
+            chunk = wanted[start:start + _BULK_CHUNK_SIZE]
+            query = _SERVER_DETAILS_SQL.format(placeholders=", ".join(["%s"] * len(chunk)))
+            cursor.execute(query, tuple(chunk))
+            for row in cursor.fetchall():
+                key = requested.get(str(row["sn"]).lower())
+                # Keep the first row per SN (matches the old fetchone()).
+                if key is not None and key not in results:
+                    results[key] = row
 
-        cursor.execute(query, (sn,))
-        row = cursor.fetchone()
-        if not row:
-            return None
-
-        columns = [
-            "sn",
-            "server_status_id",
-            "server_ok",
-            "pos",
-            "rack_sn",
-            "model",
-            "customer_ipn",
-            "test_rack_sn",
-            "tm2_ver",
-            "tester_email",
-            "started",
-            "finished",
-            "server_error_detail",
-            "failed_testcase",
-            "failed_testset",
-            "failure_message",
-            "guti",
-        ]
-
-        return dict(zip(columns, row))
+        conn_ok = True
+        return results
 
     except pymysql.MySQLError as e:
         logging.exception("Database error occurred: %s", e)
         print(f"Database error: {e}")
-        return None
+        if raise_errors:
+            raise HyvetestLookupError(f"Database error: {e}") from e
+        return results
+    except HyvetestLookupError:
+        raise
     except Exception as e:
         logging.exception("Unexpected error occurred: %s", e)
         print(f"Error fetching server details: {e}")
-        return None
+        if raise_errors:
+            raise HyvetestLookupError(f"Error fetching server details: {e}") from e
+        return results
     finally:
         if cursor is not None:
             cursor.close()
         if conn is not None:
-            conn.close()
+            if conn_ok:
+                _release_conn(conn)
+            else:
+                _close_quietly(conn)
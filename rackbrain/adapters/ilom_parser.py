@@ -5,6 +5,17 @@ from typing import List
 from rackbrain.core.models import IlomProblem
 
 DAY_RE = re.compile(r"^(Mon|Tue|Wed|Thu|Fri|Sat|Sun)\s")
+_COL_SPLIT_RE = re.compile(r"\s{2,}")
+_WEEKDAYS = frozenset(("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"))
+
+
+def _is_problem_row(line: str) -> bool:
+    """
+    Same test as DAY_RE.match (weekday + whitespace) without entering the
+    regex engine; most lines are descriptions and fail the set lookup.
+    """
+    return line[:3] in _WEEKDAYS and line[3:4].isspace()
+
 
 def extract_ilom_problems(output: str) -> List[IlomProblem]:
     """
@@ -50,6 +61,9 @@ def extract_ilom_problems(output: str) -> List[IlomProblem]:
         i += 1
 
     current: IlomProblem = None  # type: ignore
+    current_desc_lines: List[str] = []
+    is_problem_row = _is_problem_row
+    split_columns = _COL_SPLIT_RE.split
 
     while i < len(lines):
         stripped = lines[i].rstrip("\n")
@@ -59,32 +73,32 @@ def extract_ilom_problems(output: str) -> List[IlomProblem]:
             i += 1
             continue
 
-        if DAY_RE.match(stripped):
+        if is_problem_row(stripped):
             # New problem row: close out previous if any
             if current is not None:
+                current.description = "\n".join(current_desc_lines)
                 problems.append(current)
+            current_desc_lines = []
 
             # Split into columns by 2+ spaces; component is last column
-            parts = re.split(r"\s{2,}", stripped.strip())
+            row = stripped.strip()
+            parts = split_columns(row)
             if len(parts) >= 3:
                 component = parts[-1].strip()
             else:
-                component = stripped.strip()
+                component = row
 
             current = IlomProblem(component=component, description="")
         else:
             # Continuation / description line for current problem
             if current is not None:
-                text_line = stripped.lstrip()
-                if current.description:
-                    current.description += "\n" + text_line
-                else:
-                    current.description = text_line
+                current_desc_lines.append(stripped.lstrip())
 
         i += 1
 
     # Flush last problem
     if current is not None:
+        current.description = "\n".join(current_desc_lines)
         problems.append(current)
 
     return problems
\ No newline at end of file
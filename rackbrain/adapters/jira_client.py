@@ -1,7 +1,123 @@
+import json
 import os
-from typing import Any, Dict, List, Optional
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, ClassVar, Dict, Iterator, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson parses Jira's large search payloads several times faster than the
+# stdlib; it is optional and only used when installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson turns integers outside the 64-bit range into floats, where json
+# keeps them exact. Those take 19+ digits; _json_loads looks for such runs
+# with bytes.translate (digits -> "0", anything else -> " ").
+_DIGITS_TO_ZEROS = bytes(48 if 48 <= c <= 57 else 32 for c in range(256))
+_WIDE_INT_DIGITS = b"0" * 19
+
+
+def _reject_json_constant(name: str) -> Any:
+    raise ValueError(f"Invalid JSON constant: {name}")
+
+
+def _json_loads(data: bytes) -> Any:
+    """
+    json.loads(data), parsed by orjson when installed unless data holds a
+    run of 19+ digits (possibly an integer orjson would round). With orjson
+    installed, NaN/Infinity are rejected either way, as orjson does.
+    """
+    if orjson is None:
+        return json.loads(data)
+    if _WIDE_INT_DIGITS not in data.translate(_DIGITS_TO_ZEROS):
+        return orjson.loads(data)
+    return json.loads(data, parse_constant=_reject_json_constant)
+
+# Connection pool sizing for the shared session. Polling runs several
+# process_ticket workers against one client, so the requests default of
+# 10 connections per host is easy to exhaust. pool_maxsize can be raised
+# per client (the poll command passes max_workers * 4).
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+# Upper bound on concurrent searches issued by get_issues_bulk. Kept well
+# under POOL_MAXSIZE so bulk fetches never exhaust the connection pool.
+BULK_MAX_WORKERS = 8
+# Issue keys per `key in (...)` search issued by get_issues_bulk.
+BULK_CHUNK_SIZE = 100
+
+# Default (connect, read) timeouts. The connect timeout is kept short so a
+# Jira that stops accepting connections fails fast instead of tying up a
+# poll worker for the whole read timeout.
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 5.0
+DEFAULT_READ_TIMEOUT_SECONDS = 30.0
+
+# Default lifetime of get_transitions() results cached by cache_key.
+TRANSITIONS_CACHE_TTL_SECONDS = 300.0
+
+# Fields requested by search_issues when the caller does not pass any.
+# Without a projection Jira returns every field (description, comments,
+# rendered bodies), which dominates response size and parse time.
+DEFAULT_SEARCH_FIELDS = ["summary", "status", "assignee", "issuetype", "updated"]
+
+
+class JiraTransitionError(RuntimeError):
+    """
+    do_transition failed. status_code tells a rejected request (400/404:
+    nothing was changed) from other failures; it is None when no response
+    came back (e.g. a read timeout), where Jira may still have applied it.
+    """
+
+    def __init__(self, message: str, status_code: Optional[int]) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class _JiraRetry(Retry):
+    """
+    urllib3 Retry with random jitter on the exponential backoff, so parallel
+    poll workers do not retry in lockstep against a struggling Jira.
+
+    GET/PUT are retried on any status in status_forcelist. POST (comments,
+    transitions, search) is only retried when Jira says the request was not
+    processed (429/503), so a retry can never post a comment twice.
+    """
+
+    BACKOFF_JITTER = 0.5
+    POST_RETRY_STATUSES = frozenset([429, 503])
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        if backoff <= 0:
+            return 0
+        return backoff + random.uniform(0, self.BACKOFF_JITTER)
+
+    def is_retry(self, method, status_code, has_retry_after=False) -> bool:
+        if method and method.upper() == "POST":
+            return bool(self.total) and status_code in self.POST_RETRY_STATUSES
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def _build_retry() -> Retry:
+    return _JiraRetry(
+        total=3,
+        connect=3,
+        read=3,
+        backoff_factor=1.0,
+        status_forcelist=[429, 500, 502, 503, 504],
+        # POST is deliberately absent: it is not retried on read errors and
+        # only on 429/503 statuses (see _JiraRetry.is_retry).
+        allowed_methods=frozenset(["GET", "PUT"]),
+        respect_retry_after_header=True,
+        # Hand the last response back so _raise_for_status reports it.
+        raise_on_status=False,
+    )
 
 
 class JiraClient:
@@ -10,13 +126,18 @@ class JiraClient:
     Authorization: Bearer <PAT>
     """
 
+    _shared_clients: ClassVar[Dict[Tuple[str, str], "JiraClient"]] = {}
+    _shared_lock: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(
         self,
         *,
         base_url: str,
         pat: Optional[str] = None,
         pat_env: str = "RACKBRAIN_JIRA_PAT",
-        timeout_seconds: int = 30,
+        timeout_seconds: float = DEFAULT_READ_TIMEOUT_SECONDS,
+        connect_timeout_seconds: float = DEFAULT_CONNECT_TIMEOUT_SECONDS,
+        pool_maxsize: Optional[int] = None,
     ) -> None:
         self.base_url = (base_url or "").rstrip("/")
         if not self.base_url:
@@ -31,7 +152,14 @@ class JiraClient:
                 f"or set the environment variable {pat_env}."
             )
 
-        self.timeout_seconds = int(timeout_seconds)
+        self.timeout_seconds = float(timeout_seconds)
+        self.connect_timeout_seconds = float(connect_timeout_seconds)
+        # requests (connect, read) timeout tuple passed on every call.
+        self._timeout: Tuple[float, float] = (self.connect_timeout_seconds, self.timeout_seconds)
+
+        # (project, issuetype, status) -> (monotonic fetch time, transitions)
+        self._transitions_cache: Dict[Tuple[str, str, str], Tuple[float, List[Dict[str, Any]]]] = {}
+        self._transitions_lock = threading.Lock()
 
         self.session = requests.Session()
         self.session.headers.update(
@@ -41,6 +169,50 @@ class JiraClient:
                 "Accept": "application/json",
             }
         )
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=max(POOL_MAXSIZE, int(pool_maxsize or 0)),
+            # Never block a worker waiting for a free socket; overflow
+            # connections are opened and discarded instead.
+            pool_block=False,
+            max_retries=_build_retry(),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def shared(
+        cls,
+        base_url: str,
+        *,
+        pat: Optional[str] = None,
+        pat_env: str = "RACKBRAIN_JIRA_PAT",
+        timeout_seconds: float = DEFAULT_READ_TIMEOUT_SECONDS,
+        connect_timeout_seconds: float = DEFAULT_CONNECT_TIMEOUT_SECONDS,
+        pool_maxsize: Optional[int] = None,
+    ) -> "JiraClient":
+        """
+        Return a process-wide client for base_url so callers reuse one
+        Session (and its pooled keep-alive connections) instead of each
+        paying for fresh TCP/TLS handshakes. Options only apply when the
+        client is first created.
+        """
+        if pat is None or not str(pat).strip():
+            pat = os.environ.get(pat_env, "")
+        cache_key = ((base_url or "").rstrip("/"), str(pat).strip())
+        with cls._shared_lock:
+            client = cls._shared_clients.get(cache_key)
+            if client is None:
+                client = cls(
+                    base_url=base_url,
+                    pat=pat,
+                    pat_env=pat_env,
+                    timeout_seconds=timeout_seconds,
+                    connect_timeout_seconds=connect_timeout_seconds,
+                    pool_maxsize=pool_maxsize,
+                )
+                cls._shared_clients[cache_key] = client
+            return client
 
     def _url(self, path: str) -> str:
         if path.startswith("http://") or path.startswith("https://"):
@@ -57,6 +229,39 @@ class JiraClient:
                 f"Jira API error ({context}). HTTP {resp.status_code}: {resp.text}"
             )
 
+    def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        context: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Any = None,
+        stream: bool = False,
+        check: bool = True,
+    ) -> requests.Response:
+        """
+        Single entry point for Jira HTTP calls.
+
+        Transient failures (429/5xx, connection errors) are retried by the
+        session's Retry policy before a response gets here. A 401 always
+        raises; other error statuses raise unless check=False, in which case
+        the caller inspects resp.status_code itself.
+        """
+        resp = self.session.request(
+            method,
+            self._url(path),
+            params=params,
+            json=json_body,
+            stream=stream,
+            timeout=self._timeout,
+        )
+        if check:
+            self._raise_for_status(resp, context=context)
+        elif resp.status_code == 401:
+            raise RuntimeError(f"Jira 401 Unauthorized — check PAT/permissions. ({context})")
+        return resp
+
     # ---------------------------
     # Core issue methods
     # ---------------------------
@@ -65,32 +270,88 @@ class JiraClient:
         params: Dict[str, Any] = {}
         if fields:
             params["fields"] = ",".join(fields)
-        resp = self.session.get(
-            self._url(f"/rest/api/2/issue/{key}"),
+        resp = self._request(
+            "GET",
+            f"/rest/api/2/issue/{key}",
+            context=f"get_issue({key})",
             params=params,
-            timeout=self.timeout_seconds,
         )
-        self._raise_for_status(resp, context=f"get_issue({key})")
-        return resp.json()
+        return _json_loads(resp.content)
+
+    def get_issues_bulk(
+        self,
+        keys: List[str],
+        fields: Optional[List[str]] = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch many issues with one JQL search per chunk of keys
+        (`key in (...)`) instead of one GET per key.
+
+        Returns {key: issue_json} in the order of `keys`. Keys Jira does not
+        return (deleted, moved, or not visible) are absent. fields=None
+        requests all fields, like get_issue.
+        """
+        unique_keys = list(dict.fromkeys(k for k in keys if k))
+        if not unique_keys:
+            return {}
+
+        chunk_size = max(int(chunk_size), 1)
+        chunks = [
+            unique_keys[start:start + chunk_size]
+            for start in range(0, len(unique_keys), chunk_size)
+        ]
+        fetched: Dict[str, Dict[str, Any]] = {}
+        if len(chunks) == 1:
+            for issue in self._search_issue_keys(chunks[0], fields):
+                fetched[issue.get("key")] = issue
+            return {key: fetched[key] for key in unique_keys if key in fetched}
+
+        # Chunks are independent searches; run them concurrently over the
+        # pooled session. Transient 429/503s are absorbed by the Retry policy.
+        with ThreadPoolExecutor(max_workers=min(BULK_MAX_WORKERS, len(chunks))) as executor:
+            futures = [
+                executor.submit(self._search_issue_keys, chunk, fields)
+                for chunk in chunks
+            ]
+            try:
+                for future in as_completed(futures):
+                    for issue in future.result():
+                        fetched[issue.get("key")] = issue
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+        return {key: fetched[key] for key in unique_keys if key in fetched}
+
+    def _search_issue_keys(
+        self,
+        keys: List[str],
+        fields: Optional[List[str]],
+    ) -> List[Dict[str, Any]]:
+        jql = "key in ({})".format(", ".join('"{}"'.format(k) for k in keys))
+        return self.search_issues(
+            jql,
+            fields=fields or ["*all"],
+            max_results=len(keys),
+            page_size=len(keys),
+            # Unknown keys become warnings instead of failing the whole chunk.
+            validate_query=False,
+        )
 
     def add_comment(self, key: str, body: str) -> None:
-        resp = self.session.post(
-            self._url(f"/rest/api/2/issue/{key}/comment"),
-            json={"body": body},
-            timeout=self.timeout_seconds,
+        self._request(
+            "POST",
+            f"/rest/api/2/issue/{key}/comment",
+            context=f"add_comment({key})",
+            json_body={"body": body},
         )
-        self._raise_for_status(resp, context=f"add_comment({key})")
 
     def download_url_bytes(self, url: str) -> bytes:
         """
         Download raw bytes from a Jira-protected URL (e.g., attachment 'content' URL).
         """
-        resp = self.session.get(
-            self._url(str(url)),
-            stream=True,
-            timeout=self.timeout_seconds,
-        )
-        self._raise_for_status(resp, context="download_url_bytes")
+        resp = self._request("GET", str(url), context="download_url_bytes", stream=True)
         return resp.content
 
     def get_issue_comments(
@@ -103,26 +364,56 @@ class JiraClient:
             "startAt": int(start_at),
             "maxResults": int(max_results),
         }
-        resp = self.session.get(
-            self._url(f"/rest/api/2/issue/{key}/comment"),
+        resp = self._request(
+            "GET",
+            f"/rest/api/2/issue/{key}/comment",
+            context=f"get_issue_comments({key})",
             params=params,
-            timeout=self.timeout_seconds,
         )
-        self._raise_for_status(resp, context=f"get_issue_comments({key})")
-        return resp.json()
+        return _json_loads(resp.content)
 
     # ---------------------------
     # Transitions
     # ---------------------------
 
-    def get_transitions(self, key: str) -> List[Dict[str, Any]]:
-        resp = self.session.get(
-            self._url(f"/rest/api/2/issue/{key}/transitions"),
-            timeout=self.timeout_seconds,
+    def get_transitions(
+        self,
+        key: str,
+        cache_key: Optional[Tuple[str, str, str]] = None,
+        ttl: float = TRANSITIONS_CACHE_TTL_SECONDS,
+    ) -> List[Dict[str, Any]]:
+        """
+        List the transitions available for an issue.
+
+        Available transitions depend on the workflow, i.e. on the issue's
+        project, issue type and current status. Callers that know those
+        can pass cache_key=(project, issuetype, status) to share one
+        fetch across issues for `ttl` seconds. Without cache_key the
+        issue is always queried.
+        """
+        if cache_key is not None:
+            with self._transitions_lock:
+                cached = self._transitions_cache.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] < ttl:
+                return list(cached[1])
+
+        resp = self._request(
+            "GET",
+            f"/rest/api/2/issue/{key}/transitions",
+            context=f"get_transitions({key})",
         )
-        self._raise_for_status(resp, context=f"get_transitions({key})")
-        data = resp.json() or {}
-        return data.get("transitions", []) or []
+        data = _json_loads(resp.content) or {}
+        transitions = data.get("transitions", []) or []
+
+        if cache_key is not None:
+            with self._transitions_lock:
+                self._transitions_cache[cache_key] = (time.monotonic(), transitions)
+        return list(transitions)
+
+    def invalidate_transitions(self, cache_key: Tuple[str, str, str]) -> None:
+        """Drop a cached get_transitions() entry (e.g. after a stale hit)."""
+        with self._transitions_lock:
+            self._transitions_cache.pop(cache_key, None)
 
     # alias
     def list_transitions(self, key: str) -> List[Dict[str, Any]]:
@@ -134,35 +425,48 @@ class JiraClient:
         transition_id: str,
         comment_body: Optional[str] = None,
         fields: Optional[Dict[str, Any]] = None,
+        *,
+        assignee: Optional[str] = None,
     ) -> None:
         """
         Transition an issue by transition ID.
         Optionally include:
           - comment_body (update.comment add)
           - fields (e.g., resolution)
+          - assignee (fields.assignee by name), so assign + transition +
+            comment is one request. Jira rejects the whole call (changing
+            nothing) if assignee is not on the transition screen.
         """
         payload: Dict[str, Any] = {"transition": {"id": str(transition_id)}}
 
-        if fields:
-            payload["fields"] = fields
+        if fields or assignee:
+            payload["fields"] = dict(fields or {})
+        if assignee:
+            payload["fields"]["assignee"] = {"name": assignee}
 
         if comment_body:
             payload.setdefault("update", {})
             payload["update"]["comment"] = [{"add": {"body": comment_body}}]
 
-        resp = self.session.post(
-            self._url(f"/rest/api/2/issue/{key}/transitions"),
-            json=payload,
-            timeout=self.timeout_seconds,
-        )
+        try:
+            resp = self._request(
+                "POST",
+                f"/rest/api/2/issue/{key}/transitions",
+                context=f"do_transition({key})",
+                json_body=payload,
+                check=False,
+            )
+        except requests.RequestException as exc:
+            raise JiraTransitionError(
+                f"Failed to transition {key} using ID {transition_id}: {exc}", None
+            ) from exc
 
-        if resp.status_code == 401:
-            raise RuntimeError("Jira 401 Unauthorized — check PAT/permissions.")
         # Jira often returns 204 No Content on success.
         if resp.status_code not in (200, 204):
-            raise RuntimeError(
+            raise JiraTransitionError(
                 f"Failed to transition {key} using ID {transition_id}. "
-                f"HTTP {resp.status_code}: {resp.text}"
+                f"HTTP {resp.status_code}: {resp.text}",
+                resp.status_code,
             )
 
     def transition_issue(self, key: str, transition_id: str, fields: Optional[Dict[str, Any]] = None) -> None:
@@ -216,14 +520,13 @@ class JiraClient:
         if not val:
             raise RuntimeError("assign_issue: empty assignee value")
 
-        url = self._url(f"/rest/api/2/issue/{key}/assignee")
+        path = f"/rest/api/2/issue/{key}/assignee"
+        context = f"assign_issue({key})"
 
         # 1) Try legacy 'name'
-        resp = self.session.put(url, json={"name": val}, timeout=self.timeout_seconds)
+        resp = self._request("PUT", path, context=context, json_body={"name": val}, check=False)
         if resp.status_code in (200, 204):
             return
-        if resp.status_code == 401:
-            raise RuntimeError("Jira 401 Unauthorized — check PAT/permissions.")
         # If not 400/404 etc, raise immediately
         if resp.status_code not in (400, 404):
             raise RuntimeError(
@@ -231,11 +534,9 @@ class JiraClient:
             )
 
         # 2) Fallback to accountId
-        resp2 = self.session.put(url, json={"accountId": val}, timeout=self.timeout_seconds)
+        resp2 = self._request("PUT", path, context=context, json_body={"accountId": val}, check=False)
         if resp2.status_code in (200, 204):
             return
-        if resp2.status_code == 401:
-            raise RuntimeError("Jira 401 Unauthorized — check PAT/permissions.")
         raise RuntimeError(
             f"Failed to assign {key} to {val}. "
             f"name attempt: HTTP {resp.status_code}: {resp.text} | "
@@ -246,27 +547,66 @@ class JiraClient:
     # Search
     # ---------------------------
 
-    def search_issues(
+    def iter_search_issues(
         self,
         jql: str,
         fields: Optional[List[str]] = None,
-        max_results: int = 200,
-    ) -> List[Dict[str, Any]]:
+        max_results: Optional[int] = None,
+        page_size: int = 100,
+        validate_query: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield issues matching jql, following startAt pagination.
+
+        fields defaults to DEFAULT_SEARCH_FIELDS. max_results caps the total
+        number of issues yielded (None = all matches).
+        """
         payload: Dict[str, Any] = {
             "jql": jql,
-            "maxResults": int(max_results),
+            "fields": list(fields) if fields else list(DEFAULT_SEARCH_FIELDS),
         }
-        if fields:
-            payload["fields"] = fields
+        if not validate_query:
+            payload["validateQuery"] = False
+        limit = None if max_results is None else int(max_results)
+        page_size = max(int(page_size), 1)
+
+        start_at = 0
+        while limit is None or start_at < limit:
+            payload["startAt"] = start_at
+            payload["maxResults"] = page_size if limit is None else min(page_size, limit - start_at)
+            resp = self._request(
+                "POST",
+                "/rest/api/2/search",
+                context="search_issues",
+                json_body=payload,
+            )
+            data = _json_loads(resp.content) or {}
+            issues = data.get("issues", []) or []
+            if not issues:
+                return
+            for issue in issues:
+                yield issue
+            start_at += len(issues)
+            if start_at >= int(data.get("total") or 0):
+                return
 
-        resp = self.session.post(
-            self._url("/rest/api/2/search"),
-            json=payload,
-            timeout=self.timeout_seconds,
+    def search_issues(
+        self,
+        jql: str,
+        fields: Optional[List[str]] = None,
+        max_results: int = 200,
+        page_size: int = 100,
+        validate_query: bool = True,
+    ) -> List[Dict[str, Any]]:
+        return list(
+            self.iter_search_issues(
+                jql,
+                fields=fields,
+                max_results=max_results,
+                page_size=page_size,
+                validate_query=validate_query,
+            )
         )
-        self._raise_for_status(resp, context="search_issues")
-        data = resp.json() or {}
-        return data.get("issues", []) or []
 
     # ---------------------------
     # Issue links
@@ -285,13 +625,13 @@ class JiraClient:
             "outwardIssue": {"key": outward_issue_key},
         }
 
-        resp = self.session.post(
-            self._url("/rest/api/2/issueLink"),
-            json=payload,
-            timeout=self.timeout_seconds,
+        resp = self._request(
+            "POST",
+            "/rest/api/2/issueLink",
+            context="create_issue_link",
+            json_body=payload,
+            check=False,
         )
-        if resp.status_code == 401:
-            raise RuntimeError("Jira 401 Unauthorized - check PAT/permissions.")
         if resp.status_code == 400:
             body = (resp.text or "").lower()
             if "issue link" in body and ("already" in body or "exists" in body):
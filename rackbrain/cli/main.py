@@ -77,6 +77,10 @@ def main() -> None:
     base_url = jira_cfg.get("base_url", "")
     pat = jira_cfg.get("pat", "")
     pat_env = jira_cfg.get("pat_env", "RACKBRAIN_JIRA_PAT")
+    jira_timeouts = {
+        "connect_timeout_seconds": float(jira_cfg.get("timeout_connect", 5.0)),
+        "timeout_seconds": float(jira_cfg.get("timeout_read", 30.0)),
+    }
 
     # ---- Initialize logging ----
     logger = init_logger(config)
@@ -100,7 +104,7 @@ def main() -> None:
         rules = load_rules_from_files(rule_files)
         print("[INFO] Loaded %d rule(s) from %s" % (len(rules), rule_files))
 
-        jira = JiraClient(base_url=base_url, pat=pat, pat_env=pat_env)
+        jira = JiraClient.shared(base_url, pat=pat, pat_env=pat_env, **jira_timeouts)
         dry_run = args.dry_run
         skip_commands = getattr(args, "skip_commands", False)
 
@@ -124,8 +128,14 @@ def main() -> None:
         rules = load_rules_from_files(rule_files)
         print("[INFO] Loaded %d rule(s) from %s" % (len(rules), rule_files))
 
-        jira = JiraClient(base_url=base_url, pat=pat, pat_env=pat_env)
         polling_cfg = config.get("polling", {})
+        jira = JiraClient.shared(
+            base_url,
+            pat=pat,
+            pat_env=pat_env,
+            pool_maxsize=int(polling_cfg.get("max_workers", 4)) * 4,
+            **jira_timeouts,
+        )
         
         # Build JQL query
         if args.jql:
@@ -1,11 +1,22 @@
 # rackbrain/core/classification.py
 
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, FrozenSet, List, Optional, Pattern, Set, Tuple
 
 from rackbrain.core.models import ErrorEvent, Rule, RuleMatchResult
 from rackbrain.core.rules_engine import pattern_matches_text
 
+try:
+    # Optional (pyahocorasick): finds every contains needle in one pass.
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Aho-Corasick automaton per distinct set of lowered contains needles, i.e.
+# per loaded rule set.
+_AUTOMATON_CACHE: Dict[FrozenSet[str], Any] = {}
+_AUTOMATON_CACHE_MAX = 8
+
 
 def _normalize(value: Any) -> str:
     """
@@ -14,6 +25,50 @@ def _normalize(value: Any) -> str:
     return str(value).strip().lower()
 
 
+def _scope_regex(expected: Dict[str, Any]) -> Pattern:
+    """
+    Compiled form of a `{regex: ...}` scope entry, cached on the scope dict
+    (rules are loaded once, so each pattern is compiled once per process).
+    """
+    compiled = expected.get("_compiled_regex")
+    if compiled is None:
+        compiled = re.compile(str(expected["regex"]), re.IGNORECASE)
+        expected["_compiled_regex"] = compiled
+    return compiled
+
+
+def _scope_needle(expected: Dict[str, Any], key: str) -> str:
+    """
+    Lowercased `contains` / `not_contains` needle, cached on the scope dict.
+    """
+    cache_key = "_" + key + "_lower"
+    needle = expected.get(cache_key)
+    if needle is None:
+        needle = str(expected[key]).lower()
+        expected[cache_key] = needle
+    return needle
+
+
+# Scope dict key holding the pre-normalized sets of list-valued entries.
+_NORMSETS_KEY = "_normsets"
+
+
+def _scope_normsets(scope: Dict[str, Any]) -> Dict[str, frozenset]:
+    """
+    Normalized any-of sets for the list/tuple/set entries of a scope, built
+    once and cached on the scope dict.
+    """
+    normsets = scope.get(_NORMSETS_KEY)
+    if normsets is None:
+        normsets = {
+            field_name: frozenset(_normalize(item) for item in expected)
+            for field_name, expected in scope.items()
+            if isinstance(expected, (list, tuple, set))
+        }
+        scope[_NORMSETS_KEY] = normsets
+    return normsets
+
+
 def scope_matches(error_event: ErrorEvent, scope: Dict[str, Any]) -> bool:
     """
     Return True if the given ErrorEvent satisfies the rule's scope.
@@ -39,7 +94,13 @@ def scope_matches(error_event: ErrorEvent, scope: Dict[str, Any]) -> bool:
     if not scope:
         return True
 
+    # Built before iterating: the cache entry is stored on the scope itself.
+    normsets = _scope_normsets(scope)
+
     for field_name, expected in scope.items():
+        if field_name == _NORMSETS_KEY:
+            continue
+
         # Ignore unknown fields so old rules don't break
         if not hasattr(error_event, field_name):
             continue
@@ -56,12 +117,18 @@ def scope_matches(error_event: ErrorEvent, scope: Dict[str, Any]) -> bool:
         if isinstance(expected, dict):
             val_str = str(value)
             val_norm = val_str.lower()
+            # Lowered once per field and shared by contains / not_contains.
+            items_lower: Optional[List[str]] = None
+            if value_items is not None and (
+                "contains" in expected or "not_contains" in expected
+            ):
+                items_lower = [item.lower() for item in value_items]
 
             # contains: substring MUST be present (case-insensitive)
             if "contains" in expected:
-                needle = str(expected["contains"]).lower()
-                if value_items is not None:
-                    if not any(needle in str(item).lower() for item in value_items):
+                needle = _scope_needle(expected, "contains")
+                if items_lower is not None:
+                    if not any(needle in item for item in items_lower):
                         return False
                 else:
                     if needle not in val_norm:
@@ -69,9 +136,9 @@ def scope_matches(error_event: ErrorEvent, scope: Dict[str, Any]) -> bool:
 
             # not_contains: substring MUST NOT be present (case-insensitive)
             if "not_contains" in expected:
-                banned = str(expected["not_contains"]).lower()
-                if value_items is not None:
-                    if any(banned in str(item).lower() for item in value_items):
+                banned = _scope_needle(expected, "not_contains")
+                if items_lower is not None:
+                    if any(banned in item for item in items_lower):
                         return False
                 else:
                     if banned in val_norm:
@@ -79,31 +146,32 @@ def scope_matches(error_event: ErrorEvent, scope: Dict[str, Any]) -> bool:
 
             # regex: pattern MUST match (case-insensitive)
             if "regex" in expected:
-                pattern = str(expected["regex"])
+                compiled = _scope_regex(expected)
                 if value_items is not None:
                     if not any(
-                        re.search(pattern, str(item), flags=re.IGNORECASE) is not None
+                        compiled.search(item) is not None
                         for item in value_items
                     ):
                         return False
                 else:
-                    if re.search(pattern, val_str, flags=re.IGNORECASE) is None:
+                    if compiled.search(val_str) is None:
                         return False
 
         # List / tuple / set: any-of exact matches
         elif isinstance(expected, (list, tuple, set)):
+            expected_norm = normsets[field_name]
             if value_items is not None:
-                expected_norm = {_normalize(item) for item in expected}
                 if not any(_normalize(v) in expected_norm for v in value_items):
                     return False
             else:
-                if not any(_normalize(value) == _normalize(item) for item in expected):
+                if _normalize(value) not in expected_norm:
                     return False
 
         # Plain scalar: exact, case-insensitive
         else:
             if value_items is not None:
-                if not any(_normalize(v) == _normalize(expected) for v in value_items):
+                expected_norm = _normalize(expected)
+                if not any(_normalize(v) == expected_norm for v in value_items):
                     return False
             else:
                 if _normalize(value) != _normalize(expected):
@@ -112,6 +180,35 @@ def scope_matches(error_event: ErrorEvent, scope: Dict[str, Any]) -> bool:
     return True
 
 
+def _contains_automaton(needles: FrozenSet[str]) -> Any:
+    automaton = _AUTOMATON_CACHE.get(needles)
+    if automaton is None:
+        automaton = ahocorasick.Automaton()
+        for needle in needles:
+            automaton.add_word(needle, needle)
+        automaton.make_automaton()
+        if len(_AUTOMATON_CACHE) >= _AUTOMATON_CACHE_MAX:
+            _AUTOMATON_CACHE.clear()
+        _AUTOMATON_CACHE[needles] = automaton
+    return automaton
+
+
+def _get_text_for_pattern(error_event: ErrorEvent, pattern: Any) -> str:
+    """
+    Return the text haystack for this pattern.
+    Backward compatible: default to error_event.combined_text.
+    Supports dotted paths like 'ticket.summary' if the attribute chain exists.
+    """
+    source = getattr(pattern, "source", None) or "combined_text"
+
+    cur: Any = error_event
+    for part in str(source).split("."):
+        cur = getattr(cur, part, "")
+        if cur is None:
+            return ""
+    return str(cur) if not isinstance(cur, str) else cur
+
+
 def classify_error(
     error_event: ErrorEvent,
     rules: List[Rule],
@@ -123,47 +220,100 @@ def classify_error(
       - For each remaining rule, count how many patterns match the combined_text.
       - Confidence = matched_patterns_count / total_patterns_count.
       - Pick the rule with highest confidence >= min_confidence.
+
+    Rules are walked in priority order (highest first, file order within a
+    priority), so evaluation stops at the first lower priority band once a
+    match exists, and a rule's patterns stop being checked as soon as it can
+    no longer beat the best confidence so far.
     """
     best_result: Optional[RuleMatchResult] = None
 
-    for rule in rules:
+    # Text per pattern source, shared by every rule so each haystack is
+    # resolved once per event. The lowercased copy is only made for sources
+    # a contains/not_contains pattern reads; regex-only sources (often large
+    # logs) are never copied.
+    haystacks: Dict[str, str] = {}
+    haystacks_lower: Dict[str, str] = {}
+    # Match result per distinct (type, value, source): rules often repeat the
+    # same pattern, and each one only needs to be checked once per event.
+    hits: Dict[Tuple[Any, Any, str], bool] = {}
+
+    # With pyahocorasick, one automaton pass per source finds every
+    # pre-lowered contains needle (RulePattern.value_lower) in that text.
+    automaton = None
+    if ahocorasick is not None:
+        needles = frozenset(
+            p.value_lower
+            for rule in rules
+            for p in rule.patterns
+            if getattr(p, "value_lower", None)
+        )
+        if needles:
+            automaton = _contains_automaton(needles)
+    found_needles: Dict[str, Set[str]] = {}
+
+    # Stable sort: already-sorted input (see load_rules_from_files) is O(n).
+    for rule in sorted(rules, key=lambda r: -r.priority):
         # Skip rules with no patterns at all
         if not rule.patterns:
             continue
 
-        # NEW: enforce scope first
-        if not scope_matches(error_event, rule.scope):
+        # Priority trumps confidence: nothing in a lower band can win.
+        if best_result is not None and rule.priority < best_result.rule.priority:
+            break
+
+        # NEW: enforce scope first (precompiled by rules_engine when available)
+        scope_checks = getattr(rule, "scope_matchers", None)
+        if scope_checks is not None:
+            if not all(check(error_event) for check in scope_checks):
+                continue
+        elif not scope_matches(error_event, rule.scope):
             continue
 
+        # A same-priority candidate has to beat the best confidence strictly
+        # (first match wins ties) and reach min_confidence.
+        total = len(rule.patterns)
         matched: List[Any] = []
-        def _get_text_for_pattern(error_event: ErrorEvent, pattern: Any) -> str:
-            """
-            Return the text haystack for this pattern.
-            Backward compatible: default to error_event.combined_text.
-            Supports dotted paths like 'ticket.summary' if the attribute chain exists.
-            """
-            source = getattr(pattern, "source", None) or "combined_text"
-        
-            cur: Any = error_event
-            for part in str(source).split("."):
-                cur = getattr(cur, part, "")
-                if cur is None:
-                    return ""
-            return str(cur) if not isinstance(cur, str) else cur
-        
-        
-        # ... inside classify_error loop:
-        matched: List[Any] = []
-        for p in rule.patterns:
-            haystack = _get_text_for_pattern(error_event, p)
-            if pattern_matches_text(p, haystack):
+        for i, p in enumerate(rule.patterns):
+            source = getattr(p, "source", None) or "combined_text"
+            hit_key = (p.type, p.value, source)
+            hit = hits.get(hit_key)
+            if hit is None:
+                text = haystacks.get(source)
+                if text is None:
+                    text = _get_text_for_pattern(error_event, p)
+                    haystacks[source] = text
+                text_lower = None
+                if p.type in ("contains", "not_contains"):
+                    text_lower = haystacks_lower.get(source)
+                    if text_lower is None:
+                        text_lower = text.lower()
+                        haystacks_lower[source] = text_lower
+                needle = getattr(p, "value_lower", None)
+                if automaton is not None and needle:
+                    found = found_needles.get(source)
+                    if found is None:
+                        found = {value for _, value in automaton.iter(text_lower)}
+                        found_needles[source] = found
+                    hit = (needle in found) == (p.type == "contains")
+                else:
+                    hit = pattern_matches_text(p, text, text_lower)
+                hits[hit_key] = hit
+            if hit:
                 matched.append(p)
-        
+                continue
+
+            max_possible = float(len(matched) + (total - i - 1)) / float(total)
+            if max_possible < min_confidence or (
+                best_result is not None and max_possible <= best_result.confidence
+            ):
+                matched = []
+                break
 
         if not matched:
             continue
 
-        confidence = float(len(matched)) / float(len(rule.patterns))
+        confidence = float(len(matched)) / float(total)
 
         if confidence < min_confidence:
             continue
@@ -1,12 +1,46 @@
+import copy
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple, List
 
 import yaml
 
+# libyaml-backed loader when PyYAML was built with it (several times faster).
+# The pure-Python fallback parses the same way, so it is used silently: an
+# import-time message would land in stdout output such as `metrics --format json`.
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# Parsed config per file, reused while (st_mtime_ns, st_size) is unchanged.
+_config_cache: Dict[Path, Tuple[int, int, Dict[str, Any]]] = {}
+
+# discover_config_path results, keyed on everything the search depends on.
+_discover_cache: Dict[Tuple[str, ...], Path] = {}
+
+
+def yaml_safe_load(stream: Any) -> Any:
+    """
+    yaml.safe_load equivalent that prefers the C loader.
+    """
+    return yaml.load(stream, Loader=_SafeLoader)
+
 
 def _expand_path(value: str) -> Path:
-    return Path(os.path.expandvars(os.path.expanduser(value))).resolve()
+    # ~ and $VARS are expanded on every call (the environment can change),
+    # and relative paths are anchored to the current directory (which can
+    # too); only the symlink-resolving resolve() is cached.
+    expanded = os.path.expandvars(os.path.expanduser(value))
+    if not os.path.isabs(expanded):
+        expanded = os.path.join(os.getcwd(), expanded)
+    return _resolved_path(expanded)
+
+
+@lru_cache(maxsize=64)
+def _resolved_path(expanded: str) -> Path:
+    return Path(expanded).resolve()
 
 
 def _base_dir_from_config_path(config_path: Path) -> Path:
@@ -23,6 +57,25 @@ def _base_dir_from_config_path(config_path: Path) -> Path:
 
 
 def discover_config_path(explicit: Optional[str] = None) -> Path:
+    cache_key = (
+        str(explicit or ""),
+        os.environ.get("RACKBRAIN_CONFIG", ""),
+        os.environ.get("RACKBRAIN_HOME", ""),
+        os.environ.get("XDG_CONFIG_HOME", ""),
+        os.environ.get("HOME", ""),
+        os.getcwd(),
+    )
+    cached = _discover_cache.get(cache_key)
+    if cached is not None:
+        # One probe instead of walking every candidate; re-discover if the
+        # file went away.
+        try:
+            if cached.is_file():
+                return cached
+        except OSError:
+            pass
+        _discover_cache.pop(cache_key, None)
+
     candidates: List[Path] = []
 
     if explicit and str(explicit).strip():
@@ -49,6 +102,7 @@ def discover_config_path(explicit: Optional[str] = None) -> Path:
     for path in candidates:
         try:
             if path.exists() and path.is_file():
+                _discover_cache[cache_key] = path
                 return path
         except OSError:
             continue
@@ -62,11 +116,23 @@ def discover_config_path(explicit: Optional[str] = None) -> Path:
 
 
 def load_config(path: Path) -> Dict[str, Any]:
+    """
+    Parse the YAML config at `path`.
+
+    The parse is cached per file and reused until its mtime or size changes;
+    callers always get their own deep copy, so mutating it is safe.
+    """
+    st = path.stat()
+    cached = _config_cache.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return copy.deepcopy(cached[2])
+
     with path.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
+        data = yaml_safe_load(f) or {}
     if not isinstance(data, dict):
         raise ValueError(f"Config file must contain a YAML mapping: {path}")
-    return data
+    _config_cache[path] = (st.st_mtime_ns, st.st_size, data)
+    return copy.deepcopy(data)
 
 
 def _resolve_path(base_dir: Path, maybe_path: Any) -> Any:
@@ -78,7 +144,9 @@ def _resolve_path(base_dir: Path, maybe_path: Any) -> Any:
     p = Path(os.path.expandvars(os.path.expanduser(s)))
     if p.is_absolute():
         return str(p)
-    return str((base_dir / p).resolve())
+    # Lexical join/normalize: config paths don't need symlink resolution,
+    # and resolve() costs an lstat per path component.
+    return os.path.abspath(os.path.join(str(base_dir), str(p)))
 
 
 def normalize_config(config: Dict[str, Any], *, config_path: Path) -> Tuple[Dict[str, Any], Path]:
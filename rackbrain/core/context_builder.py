@@ -1,18 +1,24 @@
 # rackbrain/core/context_builder.py
 
-from typing import Any, Dict
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 from rackbrain.core.models import ErrorEvent, Ticket
-from rackbrain.adapters.hyvetest_client import fetch_server_details_from_db
+from rackbrain.adapters.hyvetest_client import (
+    fetch_server_details_bulk,
+    fetch_server_details_from_db,
+)
 from rackbrain.adapters.ilom_client import get_open_problems_output
 from rackbrain.adapters.ilom_parser import extract_ilom_problems
 from rackbrain.core.jira_extractors import (
     extract_sn_from_text,
     extract_arch_from_summary,
-    extract_testcase_from_text,
-    extract_error_details_from_text,
-    extract_kv_fields,
+    parse_description,
     get_field_loose,
+    lowercase_kv_keys,
     parse_jira_ts,
     extract_option_value,
     strip_quotes,
@@ -20,6 +26,47 @@ from rackbrain.core.jira_extractors import (
 )
 from rackbrain.core.testview_context import add_testview_context
 
+logger = logging.getLogger(__name__)
+
+# Marks a lookup that was not done (or not found in _lookup_cache).
+_UNSET: Any = object()
+
+# Concurrent ILOM fetches in prefetch_lookups.
+ILOM_BATCH_MAX_WORKERS = 8
+
+# DB row / ILOM output per (ticket key, Jira "updated", SN), so re-building
+# an unchanged ticket (e.g. on the next poll) skips the external lookups.
+# DB and ILOM state change without Jira's "updated" moving, so entries are
+# only reused for LOOKUP_CACHE_TTL_SECONDS. Oldest entries are evicted first
+# once full. Only the lookups are cached: each call still builds a fresh
+# ErrorEvent, which callers mutate.
+LOOKUP_CACHE_MAX_ENTRIES = 1024
+LOOKUP_CACHE_TTL_SECONDS = 60.0
+# cache key -> (monotonic lookup time, db_row, ilom_output). Poll workers
+# build events concurrently, so every access holds _lookup_cache_lock.
+_lookup_cache: Dict[Tuple[str, str, str], Tuple[float, Any, Any]] = {}
+_lookup_cache_lock = threading.Lock()
+
+
+def _cached_lookups(cache_key: Tuple[str, str, str]) -> Optional[Tuple[Any, Any]]:
+    with _lookup_cache_lock:
+        cached = _lookup_cache.get(cache_key)
+    if cached is None or time.monotonic() - cached[0] >= LOOKUP_CACHE_TTL_SECONDS:
+        return None
+    return cached[1], cached[2]
+
+
+def _remember_lookups(cache_key: Tuple[str, str, str], db_row: Any, ilom_output: Any) -> None:
+    with _lookup_cache_lock:
+        _lookup_cache.pop(cache_key, None)
+        while len(_lookup_cache) >= LOOKUP_CACHE_MAX_ENTRIES:
+            del _lookup_cache[next(iter(_lookup_cache))]
+        _lookup_cache[cache_key] = (time.monotonic(), db_row, ilom_output)
+
+
+def _comment_tiebreak(comment: dict):
+    return (str(comment.get("updated") or ""), str(comment.get("id") or ""))
+
 
 def build_ticket(issue: Dict[str, Any]) -> Ticket:
     """
@@ -37,35 +84,38 @@ def build_ticket(issue: Dict[str, Any]) -> Ticket:
 def build_error_event(ticket: Ticket) -> ErrorEvent:
     """
     Build a normalized ErrorEvent from a Jira Ticket.
+
+    The DB / ILOM lookups are done here, or reused from an earlier call (or
+    prefetch_lookups) for the same ticket snapshot (see _lookup_cache).
     """
     summary = ticket.summary or ""
     description = ticket.description or ""
+    fields = (ticket.raw or {}).get("fields") or {}
 
-    comments = (
-        ticket.raw.get("fields", {})
-        .get("comment", {})
-        .get("comments", [])
-    )
-    comments_text_parts = []
-    for c in comments:
-        body = c.get("body") or ""
-        comments_text_parts.append(body)
-    jira_comments_text = "\n\n".join(comments_text_parts)
+    comments = (fields.get("comment") or {}).get("comments") or []
     jira_latest_comment_text = None
     jira_latest_comment_author = None
     jira_latest_comment_author_display_name = None
     jira_latest_comment_author_email = None
 
-    if comments:
-        def _comment_sort_key(comment: dict):
-            # Jira timestamps sort lexicographically (e.g. "2025-12-20T...+0000")
-            return (
-                str(comment.get("created") or ""),
-                str(comment.get("updated") or ""),
-                str(comment.get("id") or ""),
-            )
+    # One pass over the comments: collect bodies and find the latest by
+    # "created" (Jira timestamps sort lexicographically, e.g.
+    # "2025-12-20T...+0000"); ties go to updated, then id, and the first
+    # comment wins a full tie.
+    comments_text_parts = []
+    latest_comment = None
+    latest_created = ""
+    for c in comments:
+        comments_text_parts.append(c.get("body") or "")
+        created = str(c.get("created") or "")
+        if latest_comment is None or created > latest_created:
+            latest_comment = c
+            latest_created = created
+        elif created == latest_created and _comment_tiebreak(c) > _comment_tiebreak(latest_comment):
+            latest_comment = c
+    jira_comments_text = "\n\n".join(comments_text_parts)
 
-        latest_comment = max(comments, key=_comment_sort_key)
+    if latest_comment is not None:
         jira_latest_comment_text = latest_comment.get("body") or ""
 
         author = latest_comment.get("author") or {}
@@ -78,19 +128,21 @@ def build_error_event(ticket: Ticket) -> ErrorEvent:
         jira_latest_comment_author_display_name = author.get("displayName")
         jira_latest_comment_author_email = author.get("emailAddress")
 
-    combined_text = summary + "\n\n" + description
-    sn = extract_sn_from_text(combined_text)
+    # ErrorEvent.combined_text (summary + "\n\n" + description) is built
+    # lazily; an SN lies within one whitespace-separated token, so searching
+    # summary then description finds the same first SN without joining them.
+    sn = extract_sn_from_text(summary) or extract_sn_from_text(description)
 
     # 1) Start with Jira-text-only extraction
     arch = extract_arch_from_summary(summary)
-    testcase = extract_testcase_from_text(description)
-    error_details = extract_error_details_from_text(description)
-
-    fields = ticket.raw.get("fields", {}) or {}
-    summary = fields.get("summary") or ""
-    description = fields.get("description") or ""
+    # ticket.description is the raw fields.description (see build_ticket),
+    # so one pass yields the kv fields, testcase and failure block.
+    parsed_description = parse_description(description)
+    testcase = parsed_description.testcase
+    error_details = parsed_description.error_details
 
-    kv = extract_kv_fields(description)
+    kv = parsed_description.kv
+    kv_lc = lowercase_kv_keys(kv)
 
     customer_field = fields.get("customfield_15119")
     location_field = fields.get("customfield_15143")
@@ -113,7 +165,7 @@ def build_error_event(ticket: Ticket) -> ErrorEvent:
     jira_server_status_id = kv.get("Server Status ID")
     jira_server_ok = kv.get("Server OK")
 
-    raw_slt_attempts = get_field_loose(kv, "slt attempts")
+    raw_slt_attempts = get_field_loose(kv_lc, "slt attempts", keys_lowered=True)
     jira_slt_attempts = raw_slt_attempts.strip() if raw_slt_attempts else None
 
     jira_model = kv.get("Model")
@@ -142,12 +194,32 @@ def build_error_event(ticket: Ticket) -> ErrorEvent:
     tester_email = None
     telnet_cmd = None
 
+    # db_row: fetch_server_details_from_db result (None = not found) or the
+    # exception it raised; ilom_output: get_open_problems_output result or
+    # the exception it raised.
+    db_row: Any = _UNSET
+    ilom_output: Any = _UNSET
+    cache_key = None
+    lookups_ok = True
+    db_failed = False
+    if sn and ticket.key and jira_updated:
+        cache_key = (ticket.key, str(jira_updated), sn)
+        cached = _cached_lookups(cache_key)
+        if cached is not None:
+            db_row, ilom_output = cached
+
     if sn:
-        try:
-            db_row = fetch_server_details_from_db(sn)
-        except Exception as e:
-            print(f"[WARN] DB lookup failed for SN {sn}: {e}")
+        if db_row is _UNSET:
+            try:
+                # Errors raise instead of looking like "not found" (None).
+                db_row = fetch_server_details_from_db(sn, raise_errors=True)
+            except Exception as e:
+                db_row = e
+        if isinstance(db_row, Exception):
+            print(f"[WARN] DB lookup failed for SN {sn}: {db_row}")
             db_row = None
+            db_failed = True
+            lookups_ok = False
 
         if isinstance(db_row, dict):
             server_status_id = db_row.get("server_status_id")
@@ -176,30 +248,49 @@ def build_error_event(ticket: Ticket) -> ErrorEvent:
 
     # Fallback: sometimes telnet args only appear in Jira description/combined text.
     if not telnet_cmd:
-        telnet_cmd = extract_telnet_cmd(error_details) or extract_telnet_cmd(combined_text)
+        telnet_cmd = extract_telnet_cmd(error_details) or extract_telnet_cmd(
+            summary + "\n\n" + description
+        )
 
     ilom_problems = []
     ilom_open_problems_raw = None
 
-    if arch == "EVE" and sn:
+    # An SN the DB has no row for is likely stale or misparsed; don't spend
+    # an ILOM roundtrip on it. A failed DB lookup proves nothing, so ILOM is
+    # still queried then.
+    if arch == "EVE" and sn and db_row is None and not db_failed:
+        print(f"[INFO] SN {sn} not found in DB; skipping ILOM lookup")
+    elif arch == "EVE" and sn:
+        if db_failed:
+            print(f"[INFO] DB lookup failed for SN {sn}; querying ILOM anyway")
         try:
-            raw_ilom = get_open_problems_output(sn)
+            if ilom_output is _UNSET:
+                ilom_output = get_open_problems_output(sn)
+            raw_ilom = ilom_output
+            if isinstance(raw_ilom, Exception):
+                raise raw_ilom
             ilom_problems = extract_ilom_problems(raw_ilom)
             ilom_open_problems_raw = raw_ilom
 
-            print("[DEBUG] ILOM problems count:", len(ilom_problems))
-            for p in ilom_problems:
-                print("  [DEBUG] ILOM component:", repr(p.component))
-                print("  [DEBUG] ILOM desc:", repr(p.description))
+            # Per-problem dumps are only formatted when DEBUG logging is on.
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("ILOM problems count: %d", len(ilom_problems))
+                for p in ilom_problems:
+                    logger.debug("ILOM component: %r", p.component)
+                    logger.debug("ILOM desc: %r", p.description)
         except Exception as e:
             print("[WARN] ILOM lookup failed for SN %s: %s" % (sn, e))
             ilom_problems = []
             ilom_open_problems_raw = None
+            lookups_ok = False
+
+    # Failed lookups are retried on the next call rather than cached.
+    if cache_key is not None and lookups_ok:
+        _remember_lookups(cache_key, db_row, ilom_output)
 
     error_event = ErrorEvent(
         ticket=ticket,
         sn=sn,
-        combined_text=combined_text,
         arch=arch,
         testcase=testcase,
         error_details=error_details,
@@ -242,3 +333,56 @@ def build_error_event(ticket: Ticket) -> ErrorEvent:
     add_testview_context(error_event)
 
     return error_event
+
+
+def _ilom_output_or_error(sn: str) -> Any:
+    try:
+        return get_open_problems_output(sn)
+    except Exception as e:
+        return e
+
+
+def prefetch_lookups(tickets: List[Ticket]) -> None:
+    """
+    Do the DB / ILOM lookups for many tickets up front and leave them in
+    _lookup_cache, where build_error_event for each ticket picks them up.
+
+    Server details for all SNs come from one bulk DB query instead of one
+    per ticket, and ILOM open-problem fetches for EVE servers run
+    concurrently. Failed lookups are not cached: those tickets do their own
+    in build_error_event.
+    """
+    # (cache key, SN) per ticket build_error_event would cache lookups for.
+    keyed: List[Tuple[Tuple[str, str, str], str]] = []
+    eve_sns: List[str] = []
+    for ticket in tickets:
+        summary = ticket.summary or ""
+        sn = extract_sn_from_text(summary) or extract_sn_from_text(ticket.description or "")
+        updated = ((ticket.raw or {}).get("fields") or {}).get("updated")
+        if not (sn and ticket.key and updated):
+            continue
+        keyed.append(((ticket.key, str(updated), sn), sn))
+        if extract_arch_from_summary(summary) == "EVE" and sn not in eve_sns:
+            eve_sns.append(sn)
+
+    wanted = list(dict.fromkeys(sn for _, sn in keyed))
+    if not wanted:
+        return
+    try:
+        db_rows = fetch_server_details_bulk(wanted, raise_errors=True)
+    except Exception as e:
+        print(f"[WARN] Bulk DB lookup failed for {len(wanted)} SN(s): {e}")
+        return
+
+    # ILOM is skipped for SNs the DB has no row for (see build_error_event).
+    eve_sns = [sn for sn in eve_sns if isinstance(db_rows.get(sn), dict)]
+    ilom_outputs: Dict[str, Any] = {}
+    if eve_sns:
+        with ThreadPoolExecutor(max_workers=min(ILOM_BATCH_MAX_WORKERS, len(eve_sns))) as executor:
+            ilom_outputs = dict(zip(eve_sns, executor.map(_ilom_output_or_error, eve_sns)))
+
+    for cache_key, sn in keyed:
+        ilom_output = ilom_outputs.get(sn, _UNSET)
+        if isinstance(ilom_output, Exception):
+            continue
+        _remember_lookups(cache_key, db_rows.get(sn), ilom_output)
@@ -1,12 +1,18 @@
 import re
+import string
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 
 SN_REGEX = re.compile(r"\b([A-Z0-9]{10,20})\b")
 ARCH_REGEX = re.compile(r"\b(EVE|HOP|HOPPER|WOODCHUCK)\b", re.IGNORECASE)
 FAILED_TC_REGEX = re.compile(r"Failed Testcase:\s*(.+)", re.IGNORECASE)
-FIELD_LINE_RE = re.compile(r"^([A-Za-z0-9 _]+):\s*(.*)$")
+# Characters str.splitlines() breaks lines on ("\r\n" ends with "\n").
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+_LINE_BREAK_RE = re.compile("\r\n|[" + _LINE_BREAKS + "]")
+# Characters allowed in a "Key: value" description line key.
+_KV_KEY_CHARS = frozenset(string.ascii_letters + string.digits + " _")
 # Accept pexpect-style arg dumps like:
 #   args: ['/usr/bin/telnet', '10.8.33.168', '2012']
 # and variants with optional u/b prefixes, optional quotes, extra args, and/or double-quotes.
@@ -19,12 +25,22 @@ TELNET_ARGS_RE = re.compile(
     re.IGNORECASE,
 )
 
+# Where a TELNET_ARGS_RE match can start (see _search_telnet_args).
+_ARGS_OPEN_RE = re.compile(r"args:\s*\[", re.IGNORECASE)
+
 # Fallback: plain telnet command in text
 TELNET_CMD_RE = re.compile(
     r"\btelnet\s+(\d{1,3}(?:\.\d{1,3}){3})\s+(\d{2,5})\b",
     re.IGNORECASE,
 )
 
+# _strip_jira_formatting passes, applied in this order.
+_BULLET_RE = re.compile(r"^[\*\-]\s+")
+# *emphasis* and **bold** in one pass.
+_STAR_RE = re.compile(r"\*{1,2}(.*?)\*{1,2}")
+# Any HTML tag, <strong>/<b> included.
+_TAG_RE = re.compile(r"<[^>]+>")
+
 
 def extract_sn_from_text(text: str) -> Optional[str]:
     """
@@ -33,10 +49,17 @@ def extract_sn_from_text(text: str) -> Optional[str]:
     if not text:
         return None
 
-    m = SN_REGEX.search(text)
-    if not m:
-        return None
-    return m.group(1)
+    # A SN_REGEX match is a whole 10-20 char word, so it lies inside one
+    # whitespace-separated token. Only tokens long enough to hold one are
+    # searched, in text order, so the first match is the same as a search
+    # over the full text.
+    for token in text.split():
+        if len(token) < 10:
+            continue
+        m = SN_REGEX.search(token)
+        if m:
+            return m.group(1)
+    return None
 
 
 def extract_arch_from_summary(summary: str) -> Optional[str]:
@@ -60,6 +83,43 @@ def extract_testcase_from_text(text: str) -> Optional[str]:
     return None
 
 
+def _iter_lines(text: str, start: int = 0, contains: Optional[str] = None):
+    """
+    Lazy text[start:].splitlines(): the same lines, one at a time, without
+    building the list. With `contains` (single-line text), only lines
+    holding it are yielded; the scan jumps from hit to hit, so other lines
+    are never visited or copied.
+    """
+    for line_start, line_end in _iter_line_spans(text, start, contains):
+        yield text[line_start:line_end]
+
+
+def _iter_line_spans(text: str, start: int = 0, contains: Optional[str] = None):
+    """
+    (start, end) offsets in text of the lines _iter_lines yields.
+    """
+    pos = start
+    n = len(text)
+    while pos < n:
+        if contains is not None:
+            hit = text.find(contains, pos)
+            if hit < 0:
+                return
+            # Skip to the start of the hit's line: past the last "\n", then
+            # past any rarer line break after it.
+            nl = text.rfind("\n", pos, hit)
+            if nl >= 0:
+                pos = nl + 1
+            for m in _LINE_BREAK_RE.finditer(text, pos, hit):
+                pos = m.end()
+        m = _LINE_BREAK_RE.search(text, pos)
+        end = n if m is None else m.start()
+        yield pos, end
+        if m is None:
+            return
+        pos = m.end()
+
+
 def extract_error_details_from_text(text: str) -> Optional[str]:
     """
     Extract a crude failure-message block from the ticket description.
@@ -67,27 +127,30 @@ def extract_error_details_from_text(text: str) -> Optional[str]:
     if not text:
         return None
 
-    lines = text.splitlines()
-    details_lines = []
-    in_block = False
+    idx = text.find("Failure Message:")
+    if idx < 0:
+        return None
+
+    # Only the lines from the "Failure Message:" line on are split; the
+    # line start follows str.splitlines() boundaries.
+    start = max(text.rfind(c, 0, idx) for c in _LINE_BREAKS) + 1
+    return _failure_block(text, start)
+
+
+def _failure_block(text: str, start: int) -> str:
+    """
+    The failure-message block whose first line starts at text[start].
+    """
+    lines = _iter_lines(text, start)
+    details_lines = [next(lines).strip()]
 
     for line in lines:
+        stripped = line.strip()
+        details_lines.append(stripped)
         if "Failure Message:" in line:
-            details_lines.append(line.strip())
-            in_block = True
             continue
-        if in_block:
-            if (
-                line.strip().startswith("Retry count")
-                or line.strip().startswith("Problem class:")
-                or not line.strip()
-            ):
-                details_lines.append(line.strip())
-                break
-            details_lines.append(line.strip())
-
-    if not details_lines:
-        return None
+        if stripped.startswith(("Retry count", "Problem class:")) or not stripped:
+            break
 
     return "\n".join(details_lines)
 
@@ -97,12 +160,9 @@ def _strip_jira_formatting(line: str) -> str:
         return ""
 
     line = line.strip()
-    line = re.sub(r"^[\*\-]\s+", "", line)
-    line = re.sub(r"\*\*(.*?)\*\*", r"\1", line)
-    line = re.sub(r"\*(.*?)\*", r"\1", line)
-    line = re.sub(r"</?strong>", "", line, flags=re.IGNORECASE)
-    line = re.sub(r"</?b>", "", line, flags=re.IGNORECASE)
-    line = re.sub(r"<[^>]+>", "", line)
+    line = _BULLET_RE.sub("", line)
+    line = _STAR_RE.sub(r"\1", line)
+    line = _TAG_RE.sub("", line)
 
     return line.strip()
 
@@ -112,19 +172,86 @@ def extract_kv_fields(text: str) -> dict:
     if not text:
         return fields
 
-    for line in text.splitlines():
-        clean = _strip_jira_formatting(line)
-        m = FIELD_LINE_RE.match(clean)
-        if m:
-            key = m.group(1).strip()
-            val = m.group(2).strip()
-            fields[key] = val
+    for line_start, line_end in _iter_line_spans(text, contains=":"):
+        kv = _parse_kv_line(text[line_start:line_end])
+        if kv is not None:
+            fields[kv[0]] = kv[1]
 
     return fields
 
 
-def get_field_loose(fields: dict, needle: str) -> Optional[str]:
+def _parse_kv_line(line: str) -> Optional[Tuple[str, str]]:
+    # Stripping only removes characters, so a line without ":" can never
+    # become "key: value"; skip it before running any regex.
+    if ":" not in line:
+        return None
+    clean = _strip_jira_formatting(line)
+    key, sep, val = clean.partition(":")
+    if not sep or not key or not all(c in _KV_KEY_CHARS for c in key):
+        return None
+    return key.strip(), val.strip()
+
+
+@dataclass
+class ParsedDescription:
+    """
+    Everything build_error_event reads from a ticket description.
+    """
+    kv: Dict[str, str] = field(default_factory=dict)
+    testcase: Optional[str] = None
+    error_details: Optional[str] = None
+
+
+def parse_description(text: str) -> ParsedDescription:
+    """
+    extract_kv_fields + extract_testcase_from_text +
+    extract_error_details_from_text in one call. Results are identical to
+    calling the three separately.
+
+    The kv fields and the failure-message block come from one walk over the
+    lines holding ":" (the "Failure Message:" line is one of them). The
+    testcase is a separate FAILED_TC_REGEX search: its pattern may span
+    lines (\s* eats newlines) and matches case-insensitively.
+    """
+    parsed = ParsedDescription()
+    if not text:
+        return parsed
+
+    parsed.testcase = extract_testcase_from_text(text)
+
+    kv = parsed.kv
+    want_failure_block = True
+    for line_start, line_end in _iter_line_spans(text, contains=":"):
+        line = text[line_start:line_end]
+        if want_failure_block and "Failure Message:" in line:
+            parsed.error_details = _failure_block(text, line_start)
+            want_failure_block = False
+        item = _parse_kv_line(line)
+        if item is not None:
+            kv[item[0]] = item[1]
+
+    return parsed
+
+
+def lowercase_kv_keys(fields: dict) -> dict:
+    """
+    {key.strip().lower(): value} for get_field_loose(..., keys_lowered=True),
+    so repeated loose lookups don't re-normalize every key. The first key
+    wins on collisions, matching get_field_loose's first-match order.
+    """
+    lowered = {}
+    for k, v in fields.items():
+        lowered.setdefault(k.strip().lower(), v)
+    return lowered
+
+
+def get_field_loose(fields: dict, needle: str, *, keys_lowered: bool = False) -> Optional[str]:
     needle = needle.lower()
+    if keys_lowered:
+        for k, v in fields.items():
+            if needle in k:
+                return v
+        return None
     for k, v in fields.items():
         if needle in k.strip().lower():
             return v
@@ -134,8 +261,24 @@ def get_field_loose(fields: dict, needle: str) -> Optional[str]:
 def parse_jira_ts(ts: Optional[str]) -> Optional[datetime]:
     if not ts:
         return None
+    ts = ts.strip()
+    # Fast path for the exact "YYYY-MM-DD HH:MM:SS" shape; anything else
+    # (single-digit fields, etc.) goes through strptime as before.
+    if (
+        len(ts) == 19
+        and ts[4] == "-" and ts[7] == "-" and ts[10] == " "
+        and ts[13] == ":" and ts[16] == ":"
+        and (ts[0:4] + ts[5:7] + ts[8:10] + ts[11:13] + ts[14:16] + ts[17:19]).isdigit()
+    ):
+        try:
+            return datetime(
+                int(ts[0:4]), int(ts[5:7]), int(ts[8:10]),
+                int(ts[11:13]), int(ts[14:16]), int(ts[17:19]),
+            )
+        except ValueError:
+            pass
     try:
-        return datetime.strptime(ts.strip(), "%Y-%m-%d %H:%M:%S")
+        return datetime.strptime(ts, "%Y-%m-%d %H:%M:%S")
     except Exception:
         return None
 
@@ -156,10 +299,41 @@ def strip_quotes(val: Optional[str]) -> Optional[str]:
     return s
 
 
+def _search_telnet_args(text: str):
+    """
+    Same result as TELNET_ARGS_RE.search(text) without its worst case.
+
+    No part of the pattern can match "]", so a match starting at "args: ["
+    ends at the first "]" after it; the regex only runs on that span, and
+    not at all when there is none (an unterminated dump made the plain
+    search go cubic). Later starts closed by the same "]" are skipped: the
+    leading [^\]]* can absorb their prefix, so they can't match where the
+    earlier start failed.
+    """
+    tried_close = -1
+    for opening in _ARGS_OPEN_RE.finditer(text):
+        close = text.find("]", opening.end())
+        if close < 0:
+            return None
+        if close == tried_close:
+            continue
+        tried_close = close
+        m = TELNET_ARGS_RE.match(text, opening.start(), close + 1)
+        if m:
+            return m
+    return None
+
+
 def extract_telnet_cmd(text: Optional[str]) -> Optional[str]:
     if not text:
         return None
-    m = TELNET_ARGS_RE.search(text)
+    # Both patterns need the word "telnet" (any case); most tickets have
+    # none, so skip the (backtracking-prone) regex scans entirely. The
+    # exact-case test first avoids lowercasing the text in the usual
+    # "/usr/bin/telnet" case.
+    if "telnet" not in text and "telnet" not in text.lower():
+        return None
+    m = _search_telnet_args(text)
     if m:
         ip, port = m.group(1), m.group(2)
         return f"telnet {ip} {port}"
@@ -1,11 +1,34 @@
 # rackbrain/core/models.py
 
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Union
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, List, Optional, Pattern, Union
 from dataclasses import field
 from typing import Optional
 
 
+def _slotted(cls):
+    """
+    Rebuild a dataclass with __slots__ for its fields, i.e.
+    @dataclass(slots=True) for Pythons before 3.10. Instances then carry no
+    per-instance __dict__, so assigning an undeclared attribute raises
+    AttributeError: declare every attribute code sets on these models. Give
+    fields init=True (the default): an init=False field with a plain
+    default would be left unset.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names:
+        # Field defaults live on in the generated __init__.
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+@_slotted
 @dataclass
 class Ticket:
     """
@@ -16,11 +39,13 @@ class Ticket:
     description: str
     raw: Dict[str, Any]  # full Jira JSON if we need extra fields later
 
+@_slotted
 @dataclass
 class IlomProblem:
     component: str
     description: str  # full multi-line description
 
+@_slotted
 @dataclass
 class CommandResult:
     """
@@ -35,6 +60,7 @@ class CommandResult:
     stderr: str  # stderr
     selected_lines: Optional[str] = None  # selected subset of stdout
     
+@_slotted
 @dataclass
 class ErrorEvent:
     """
@@ -42,7 +68,8 @@ class ErrorEvent:
     """
     ticket: Ticket
     sn: Optional[str]
-    combined_text: str
+    # Backs the lazy combined_text property below.
+    _combined_text: Optional[str] = field(default=None, repr=False, compare=False)
 
     # Derived from Jira summary/description
     arch: Optional[str] = None          # "EVE", "HOPPER", etc.
@@ -128,8 +155,23 @@ class ErrorEvent:
     testview_start_operation: Optional[str] = None
     testview_start_use_validate: bool = True
 
+    # Set by ticket_processor for cinder_verification rules
+    cinder_report: Optional[str] = None
+
+    @property
+    def combined_text(self) -> str:
+        """
+        Jira summary + description, built on first access and then reused.
+        """
+        text = self._combined_text
+        if text is None:
+            text = (self.ticket.summary or "") + "\n\n" + (self.ticket.description or "")
+            self._combined_text = text
+        return text
+
 
 
+@_slotted
 @dataclass
 class RulePattern:
     """
@@ -140,7 +182,12 @@ class RulePattern:
     type: str
     value: str
     source: Optional[str] = None   # NEW: where to read text from (default combined_text)
+    # Precomputed at load time (see rules_engine._load_rule_from_dict); None
+    # means pattern_matches_text derives them from `value` per call.
+    value_lower: Optional[str] = field(default=None, repr=False, compare=False)
+    compiled: Optional[Pattern] = field(default=None, repr=False, compare=False)
 
+@_slotted
 @dataclass
 class RuleCommandStep:
     """
@@ -191,6 +238,7 @@ class RuleCommandStep:
     testview_use_validate_on_fail: bool = True
 
 
+@_slotted
 @dataclass
 class RuleIssueLinkAction:
     """
@@ -206,6 +254,7 @@ class RuleIssueLinkAction:
     target: str
 
 
+@_slotted
 @dataclass
 class RuleAction:
     """
@@ -278,6 +327,7 @@ class RuleAction:
     testview: Optional[Dict[str, Any]] = None
 
 
+@_slotted
 @dataclass
 class Rule:
     """
@@ -292,8 +342,14 @@ class Rule:
     priority: int = 0  # Higher priority rules win when multiple match (default: 0)
     allow_on_same_failure: bool = False
     allow_high_slt_attempts: bool = False  # allow running when jira_slt_attempts exceeds MAX_SLT_ATTEMPTS
+    # scope compiled to per-field checks at load time (see rules_engine.compile_scope);
+    # None means classify_error interprets `scope` directly.
+    scope_matchers: Optional[List[Callable[[Any], bool]]] = field(
+        default=None, repr=False, compare=False
+    )
 
 
+@_slotted
 @dataclass
 class RuleMatchResult:
     """
@@ -1,21 +1,146 @@
 # rackbrain/core/rules_engine.py
 
+import hashlib
+import json
 import os
 import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import fields
 from pathlib import Path
-from typing import List
-
-import yaml
+from typing import Any, Callable, Dict, List, Optional, Pattern
 
+from rackbrain.core.config_loader import yaml_safe_load
 from rackbrain.core.models import Rule, RuleAction, RulePattern, RuleCommandStep, RuleIssueLinkAction
 
+try:
+    # Optional: validates each rule file against RULE_FILE_SCHEMA up front.
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+# Compiled rule regexes, keyed by pattern string (bounded by the rule set).
+_REGEX_CACHE: Dict[str, Pattern] = {}
+
+
+def _compiled_regex(value: str) -> Pattern:
+    compiled = _REGEX_CACHE.get(value)
+    if compiled is None:
+        compiled = re.compile(value, re.IGNORECASE)
+        _REGEX_CACHE[value] = compiled
+    return compiled
+
+
+_MISSING = object()
+
+
+def _normalize_scope_value(value: Any) -> str:
+    # Same normalization as classification.scope_matches.
+    return str(value).strip().lower()
+
+
+def _compile_scope_entry(field_name: str, expected: Any) -> Callable[[Any], bool]:
+    """
+    Build the check for one scope entry, with needles lowered, regexes
+    compiled and any-of sets normalized up front. Semantics match
+    classification.scope_matches (unknown event fields pass, None fails).
+    """
+    if isinstance(expected, dict):
+        needle = str(expected["contains"]).lower() if "contains" in expected else None
+        banned = str(expected["not_contains"]).lower() if "not_contains" in expected else None
+        compiled = _compiled_regex(str(expected["regex"])) if "regex" in expected else None
+
+        def check_dict(event: Any) -> bool:
+            value = getattr(event, field_name, _MISSING)
+            if value is _MISSING:
+                return True
+            if value is None:
+                return False
+            if isinstance(value, (list, tuple, set)):
+                items = [str(v) for v in value if v is not None]
+                if needle is not None or banned is not None:
+                    lowered = [item.lower() for item in items]
+                    if needle is not None and not any(needle in item for item in lowered):
+                        return False
+                    if banned is not None and any(banned in item for item in lowered):
+                        return False
+                if compiled is not None and not any(
+                    compiled.search(item) is not None for item in items
+                ):
+                    return False
+                return True
+            text = str(value)
+            text_lower = text.lower()
+            if needle is not None and needle not in text_lower:
+                return False
+            if banned is not None and banned in text_lower:
+                return False
+            if compiled is not None and compiled.search(text) is None:
+                return False
+            return True
+
+        return check_dict
+
+    if isinstance(expected, (list, tuple, set)):
+        allowed = frozenset(_normalize_scope_value(item) for item in expected)
+    else:
+        allowed = frozenset([_normalize_scope_value(expected)])
+
+    def check_any_of(event: Any) -> bool:
+        value = getattr(event, field_name, _MISSING)
+        if value is _MISSING:
+            return True
+        if value is None:
+            return False
+        if isinstance(value, (list, tuple, set)):
+            return any(
+                _normalize_scope_value(v) in allowed for v in value if v is not None
+            )
+        return _normalize_scope_value(value) in allowed
+
+    return check_any_of
+
+
+def compile_scope(scope: Dict[str, Any]) -> List[Callable[[Any], bool]]:
+    """
+    Compile a rule scope into checks that all must pass for an ErrorEvent.
+    """
+    return [
+        _compile_scope_entry(field_name, expected)
+        for field_name, expected in (scope or {}).items()
+    ]
+
+
+def _build_pattern(p: dict) -> RulePattern:
+    pattern = RulePattern(
+        type=p.get("type"),
+        value=p.get("value"),
+        source=p.get("source"),   # NEW
+    )
+    if not isinstance(pattern.value, str):
+        return pattern
+    if pattern.type in ("contains", "not_contains"):
+        pattern.value_lower = pattern.value.lower()
+    elif pattern.type == "regex":
+        try:
+            pattern.compiled = _compiled_regex(pattern.value)
+        except re.error:
+            # Left uncompiled so the error surfaces at match time, as before.
+            pass
+    return pattern
+
+
+# YAML keys copied straight into RuleCommandStep / RuleAction; missing keys
+# fall back to the dataclass defaults. id, cmd, command_steps and link_issue
+# are built by _load_rule_from_dict itself.
+_STEP_KEYS = frozenset(f.name for f in fields(RuleCommandStep)) - {"id", "cmd"}
+_ACTION_KEYS = frozenset(f.name for f in fields(RuleAction)) - {"command_steps", "link_issue"}
+
+
 def _load_rule_from_dict(data: dict) -> Rule:
     patterns = [
-        RulePattern(
-            type=p.get("type"),
-            value=p.get("value"),
-            source=p.get("source"),   # NEW
-        )
+        _build_pattern(p)
         for p in data.get("patterns", [])
     ]
 
@@ -33,117 +158,32 @@ def _load_rule_from_dict(data: dict) -> Rule:
     steps_data = action_data.get("command_steps") or []
     command_steps = []
     for idx, step in enumerate(steps_data, start=1):
-        # Auto-generate ID if not provided
-        cmd_id = step.get("id") or f"cmd_{idx}"
+        # Keys left out of the YAML take the RuleCommandStep field defaults.
+        kwargs = {k: v for k, v in step.items() if k in _STEP_KEYS}
         command_steps.append(
             RuleCommandStep(
-                id=cmd_id,
+                # Auto-generate ID if not provided
+                id=step.get("id") or f"cmd_{idx}",
                 cmd=step["cmd"],
-                timer_after_seconds=step.get("timer_after_seconds"),
-                for_each_extract=step.get("for_each_extract"),
-                expect_status=step.get("expect_status"),
-                expect_contains=step.get("expect_contains"),
-                expect_not_contains=step.get("expect_not_contains"),
-                on_expect_fail_comment=step.get("on_expect_fail_comment"),
-                on_expect_pass_comment=step.get("on_expect_pass_comment"),
-                stop_on_decision=step.get("stop_on_decision", True),
-
-                line_contains=step.get("line_contains"),
-                line_not_contains=step.get("line_not_contains"),
-                line_before=step.get("line_before", 0),
-                line_after=step.get("line_after", 0),
-                line_only=step.get("line_only", False),
-                line_between_start_contains=step.get("line_between_start_contains"),
-                line_between_end_contains=step.get("line_between_end_contains"),
-                line_after_contains=step.get("line_after_contains"),
-                line_after_chars=step.get("line_after_chars", 0),
-                between_start_contains=step.get("between_start_contains"),
-                between_end_contains=step.get("between_end_contains"),
-                if_previous_contains=step.get("if_previous_contains"),
-                start_testview_on_pass=step.get("start_testview_on_pass", False),
-                start_testview_on_fail=step.get("start_testview_on_fail", False),
-                testview_operation_on_pass=step.get("testview_operation_on_pass", "SLT"),
-                testview_operation_on_fail=step.get("testview_operation_on_fail", "SLT"),
-                testview_use_validate_on_pass=step.get("testview_use_validate_on_pass", True),
-                testview_use_validate_on_fail=step.get("testview_use_validate_on_fail", True),
-
+                **kwargs
             )
         )
-    
+
     action = RuleAction(
-        type=action_data.get("type", "comment_only"),
-        close=action_data.get("close", False),
-        comment_template=action_data.get("comment_template", ""),
-        ilom_filter_contains=action_data.get("ilom_filter_contains"),
-        timer_after_seconds=action_data.get("timer_after_seconds"),
         command_steps=command_steps or None,
-        text_extracts=action_data.get("text_extracts"),
-        assign_to=action_data.get("assign_to"),
-        reassign_to=action_data.get("reassign_to"),
-        transition_to=action_data.get("transition_to"),
         link_issue=link_issue,
-        testview=action_data.get("testview"),
-
-        # NEW: plumb failure_message_* from YAML into RuleAction
-        failure_message_line_contains=action_data.get("failure_message_line_contains"),
-        failure_message_line_before=action_data.get("failure_message_line_before", 0),
-        failure_message_line_after=action_data.get("failure_message_line_after", 0),
-        failure_message_line_between_start_contains=action_data.get(
-            "failure_message_line_between_start_contains"
-        ),
-        failure_message_line_between_end_contains=action_data.get(
-            "failure_message_line_between_end_contains"
-        ),
-        failure_message_line_after_contains=action_data.get(
-            "failure_message_line_after_contains"
-        ),
-        failure_message_line_after_chars=action_data.get(
-            "failure_message_line_after_chars", 0
-        ),
-        failure_message_between_start_contains=action_data.get(
-            "failure_message_between_start_contains"
-        ),
-        failure_message_between_end_contains=action_data.get(
-            "failure_message_between_end_contains"
-        ),
-
-         # NEW: TestView log selectors
-        testview_testcase_contains=action_data.get("testview_testcase_contains"),
-        testview_testset=action_data.get("testview_testset"),
-        testview_line_contains=action_data.get("testview_line_contains"),
-        testview_line_before=action_data.get("testview_line_before", 0),
-        testview_line_after=action_data.get("testview_line_after", 0),
-        testview_line_between_start_contains=action_data.get(
-            "testview_line_between_start_contains"
-        ),
-        testview_line_between_end_contains=action_data.get(
-            "testview_line_between_end_contains"
-        ),
-        testview_line_after_contains=action_data.get("testview_line_after_contains"),
-        testview_line_after_chars=action_data.get("testview_line_after_chars", 0),
-        testview_between_start_contains=action_data.get(
-            "testview_between_start_contains"
-        ),
-        testview_between_end_contains=action_data.get(
-            "testview_between_end_contains"
-        ),
-         testview_filter_line_contains=action_data.get(
-            "testview_filter_line_contains"
-        ),
-
-                # NEW: TestView start controls
-        start_slt=action_data.get("start_slt", False),
-        slt_operation=action_data.get("slt_operation", "SLT"),
-        slt_use_validate=action_data.get("slt_use_validate", True),
-
+        **{k: v for k, v in action_data.items() if k in _ACTION_KEYS}
     )
 
 
+    scope = data.get("scope", {}) or {}
+
     return Rule(
         id=data["id"],
         name=data.get("name", data["id"]),
         description=data.get("description", ""),
-        scope=data.get("scope", {}) or {},
+        scope=scope,
+        scope_matchers=compile_scope(scope),
         patterns=patterns,
         action=action,
         priority=data.get("priority", 0),  # Default priority is 0
@@ -154,6 +194,170 @@ def _load_rule_from_dict(data: dict) -> Rule:
 
 
 
+# Structure _load_rule_from_dict relies on. Only shapes it cannot load are
+# rejected; the remaining checks (e.g. link_issue type/target) stay in the
+# loader.
+RULE_FILE_SCHEMA: Dict[str, Any] = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "array",
+    "items": {
+        "type": "object",
+        "required": ["id"],
+        "properties": {
+            "patterns": {"items": {"type": "object"}},
+            "action": {
+                "properties": {
+                    "command_steps": {
+                        "items": {"type": "object", "required": ["cmd"]},
+                    },
+                },
+            },
+        },
+    },
+}
+
+# Generated validator for RULE_FILE_SCHEMA; None without fastjsonschema.
+_validate_rule_file = fastjsonschema.compile(RULE_FILE_SCHEMA) if fastjsonschema else None
+
+
+def _check_rule_file(path: Path, data: List[dict]) -> None:
+    if _validate_rule_file is None:
+        return
+    try:
+        _validate_rule_file(data)
+    except fastjsonschema.JsonSchemaValueException as e:
+        raise ValueError(f"Rule file {path}: {e.message}") from e
+
+
+# Rule files are parsed in worker processes when there are at least this
+# many; below it, pool startup costs more than the parallel parse saves.
+PARALLEL_PARSE_MIN_FILES = 4
+
+# Parsed rule files are cached as JSON under $XDG_CACHE_HOME/rackbrain/rules,
+# one entry per rule file path, keyed by the sha256 of the file bytes. Bump
+# to invalidate existing entries.
+RULE_CACHE_VERSION = 2
+
+
+def _resolve_rule_file(path_str: str) -> Path:
+    path = Path(path_str)
+    if not path.is_absolute():
+        path = Path(os.getcwd()) / path
+
+    if not path.exists():
+        raise FileNotFoundError(f"Rule file not found: {path}")
+    return path
+
+
+def _rule_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "rackbrain" / "rules"
+
+
+def _rule_cache_prefix(path: Path) -> str:
+    return hashlib.sha256(str(path).encode("utf-8")).hexdigest()[:16]
+
+
+def _rule_cache_file(path: Path, digest: str) -> Path:
+    return _rule_cache_dir() / f"{_rule_cache_prefix(path)}-{digest}.v{RULE_CACHE_VERSION}.json"
+
+
+def _load_cached_rule_dicts(path: Path, digest: str) -> Optional[List[dict]]:
+    try:
+        with _rule_cache_file(path, digest).open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        # Missing, unreadable or corrupt: parse the YAML instead.
+        return None
+    return data if isinstance(data, list) else None
+
+
+def _store_cached_rule_dicts(path: Path, digest: str, data: List[dict]) -> None:
+    try:
+        text = json.dumps(data)
+    except (TypeError, ValueError):
+        return
+    # YAML values JSON can't hold exactly (dates, non-string keys, ...) would
+    # come back changed; such files are just parsed each time.
+    if json.loads(text) != data:
+        return
+
+    target = _rule_cache_file(path, digest)
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=str(target.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_name, str(target))
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+    except Exception as e:
+        # The cache is only an optimization.
+        print(f"[WARN] Could not cache parsed rule file {target.name}: {e}")
+        return
+
+    # Entries for earlier versions of this file (and v1 pickles) are never
+    # read again.
+    stale = list(target.parent.glob(f"{_rule_cache_prefix(path)}-*.json"))
+    stale.extend(target.parent.glob("*.pkl"))
+    for old in stale:
+        if old != target:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def _parse_rule_file(path: Path, raw: bytes) -> List[dict]:
+    """
+    Parse one rule file's bytes into its list of rule dicts (picklable, so
+    it can run in a worker process).
+    """
+    # Bytes straight to the (C) loader, which decodes UTF-8 itself.
+    data = yaml_safe_load(raw) or []
+
+    if not isinstance(data, list):
+        raise ValueError(f"Rule file {path} must contain a YAML list of rules.")
+    return data
+
+
+def _parse_rule_files(paths: List[Path]) -> List[List[dict]]:
+    """
+    Rule dicts for each file, in order. Files whose exact bytes were parsed
+    before come from the on-disk cache; only the rest hit the YAML parser.
+    """
+    raw_files = [path.read_bytes() for path in paths]
+    digests = [hashlib.sha256(raw).hexdigest() for raw in raw_files]
+    parsed = [_load_cached_rule_dicts(path, digest) for path, digest in zip(paths, digests)]
+
+    missing = [i for i, data in enumerate(parsed) if data is None]
+    if not missing:
+        return parsed
+
+    missing_paths = [paths[i] for i in missing]
+    missing_raw = [raw_files[i] for i in missing]
+    fresh = None
+    if len(missing) >= PARALLEL_PARSE_MIN_FILES:
+        workers = min(os.cpu_count() or 1, len(missing))
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    fresh = list(executor.map(_parse_rule_file, missing_paths, missing_raw))
+            except (OSError, BrokenProcessPool) as e:
+                # No usable process pool here; any real parse error is
+                # raised again by the serial pass.
+                print(f"[WARN] Parallel rule parsing failed ({e}); parsing serially.")
+    if fresh is None:
+        fresh = [_parse_rule_file(path, raw) for path, raw in zip(missing_paths, missing_raw)]
+
+    for i, data in zip(missing, fresh):
+        parsed[i] = data
+        _store_cached_rule_dicts(paths[i], digests[i], data)
+    return parsed
+
+
 def load_rules_from_files(rule_files: List[str]) -> List[Rule]:
     """
     Load all rules from the given YAML files.
@@ -163,40 +367,45 @@ def load_rules_from_files(rule_files: List[str]) -> List[Rule]:
     """
     rules: List[Rule] = []
 
-    for path_str in rule_files:
-        path = Path(path_str)
-        if not path.is_absolute():
-            path = Path(os.getcwd()) / path
-
-        if not path.exists():
-            raise FileNotFoundError(f"Rule file not found: {path}")
-
-        with path.open("r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or []
-
-        if not isinstance(data, list):
-            raise ValueError(f"Rule file {path} must contain a YAML list of rules.")
-
+    paths = [_resolve_rule_file(path_str) for path_str in rule_files]
+    for path, data in zip(paths, _parse_rule_files(paths)):
+        _check_rule_file(path, data)
         for rule_dict in data:
             rules.append(_load_rule_from_dict(rule_dict))
 
+    # Highest priority first; the sort is stable so file order still breaks
+    # ties. classify_error relies on this to stop at the first lower band.
+    rules.sort(key=lambda r: -r.priority)
     return rules
 
 
-def pattern_matches_text(pattern: RulePattern, text: str) -> bool:
+def pattern_matches_text(
+    pattern: RulePattern,
+    text: str,
+    text_lower: Optional[str] = None,
+) -> bool:
     """
     Check whether a single pattern matches the given text.
+
+    text_lower, if given, must be text.lower(); callers checking many
+    patterns against the same text pass it to avoid re-lowering per pattern.
     """
     haystack = text or ""
 
-    if pattern.type == "contains":
-        return pattern.value.lower() in haystack.lower()
-
-    if pattern.type == "not_contains":
-        return pattern.value.lower() not in haystack.lower()
+    if pattern.type in ("contains", "not_contains"):
+        if text_lower is None:
+            text_lower = haystack.lower()
+        needle = pattern.value_lower
+        if needle is None:
+            needle = pattern.value.lower()
+        found = needle in text_lower
+        return found if pattern.type == "contains" else not found
 
     if pattern.type == "regex":
-        return re.search(pattern.value, haystack, flags=re.IGNORECASE) is not None
+        compiled = pattern.compiled
+        if compiled is None:
+            compiled = _compiled_regex(pattern.value)
+        return compiled.search(haystack) is not None
 
     # Unknown pattern type: treat as no match
     return False
@@ -11,13 +11,21 @@ NO_IP_CODE = 10
 # Try to import the remote helper (SR1 → RAMSES).
 # If it isn't available, we'll fall back to local eve_cmd_runner.sh.
 try:
-    from rackbrain.eve_remote import run_eve_remote, find_remote_wrapper_path  # type: ignore
+    from rackbrain.eve_remote import (  # type: ignore
+        EveRemoteError,
+        find_remote_wrapper_path,
+        run_eve_remote,
+    )
 except ImportError:  # running in an older layout / on RAMSES directly
     run_eve_remote = None  # type: ignore
     find_remote_wrapper_path = None  # type: ignore
+    EveRemoteError = ()  # type: ignore  # nothing remote to catch
 
 
 class EveCommandResult(object):
+    # One instance per command run; no per-instance __dict__.
+    __slots__ = ("serial", "context", "cmd", "status", "stdout", "stderr", "executed")
+
     def __init__(self, serial, context, cmd, status, stdout, stderr, executed=True):
         self.serial = serial
         self.context = context  # "ilom", "hostnic", "rot", "diag", "local"
@@ -54,6 +62,47 @@ def _parse_context(cmd_with_context):
     return context, inner_cmd
 
 
+def _run_remote_impl(serial, cmd_with_context):
+    # Use the SR1 → RAMSES path (already tested by you)
+    result = run_eve_remote(serial, cmd_with_context)
+    # diag_status is the true exit code from eve_cmd_runner.sh
+    diag_status = result.get("diag_status")
+    executed = diag_status is not None
+    status = diag_status if diag_status is not None else result.get("returncode", 1)
+    stdout = result.get("stdout") or ""
+    stderr = result.get("stderr") or ""
+    return status, stdout, stderr, executed
+
+
+def _run_local_impl(serial, cmd_with_context):
+    # Legacy / direct mode: run eve_cmd_runner.sh on this host
+    proc = subprocess.run(
+        [EVE_CMD_RUNNER, "--sn", serial, "--cmd", cmd_with_context],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,  # Python 3.6-friendly text mode
+    )
+    return proc.returncode, proc.stdout, proc.stderr, True
+
+
+# _run_remote_impl or _run_local_impl, chosen by the first run_eve_command
+# call: whether the wrapper script exists doesn't change while we run.
+_RUN_IMPL = None
+
+
+def refresh_eve_impl():
+    """
+    Re-check for the remote wrapper (e.g. after installing it, or in tests)
+    and return the implementation run_eve_command will use from now on.
+    """
+    global _RUN_IMPL
+    # Prefer remote path when helper is available and the wrapper script exists.
+    wrapper_path = find_remote_wrapper_path() if find_remote_wrapper_path is not None else None
+    use_remote = run_eve_remote is not None and bool(wrapper_path)
+    _RUN_IMPL = _run_remote_impl if use_remote else _run_local_impl
+    return _RUN_IMPL
+
+
 def run_eve_command(serial, cmd_with_context):
     """
     Run a command like "{diag} hwdiag io config" or "{ilom} show SYS"
@@ -66,40 +115,23 @@ def run_eve_command(serial, cmd_with_context):
       - On a TE box (like RAMSES) without the remote helper/module:
             local eve_cmd_runner.sh
 
+    The path is picked once per process (see refresh_eve_impl). If the
+    remote path fails and the wrapper has since disappeared, the path is
+    re-picked and the command runs locally instead.
+
     Returns an EveCommandResult.
     """
     context, inner_cmd = _parse_context(cmd_with_context)
 
-    stdout = ""
-    stderr = ""
-    status = 1
-
-    # Prefer remote path when helper is available and the wrapper script exists.
-    wrapper_path = find_remote_wrapper_path() if find_remote_wrapper_path is not None else None
-    use_remote = run_eve_remote is not None and bool(wrapper_path)
-
-    if use_remote:
-        # Use the SR1 → RAMSES path (already tested by you)
-        result = run_eve_remote(serial, cmd_with_context)
-        # diag_status is the true exit code from eve_cmd_runner.sh
-        diag_status = result.get("diag_status")
-        executed = diag_status is not None
-        status = diag_status if diag_status is not None else result.get("returncode", 1)
-        stdout = result.get("stdout") or ""
-        stderr = result.get("stderr") or ""
-    else:
-        # Legacy / direct mode: run eve_cmd_runner.sh on this host
-        proc = subprocess.run(
-            [EVE_CMD_RUNNER, "--sn", serial, "--cmd", cmd_with_context],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            universal_newlines=True,  # Python 3.6-friendly text mode
-        )
-        status = proc.returncode
-        stdout = proc.stdout
-        stderr = proc.stderr
-        executed = True
-
+    run_impl = _RUN_IMPL or refresh_eve_impl()
+    try:
+        status, stdout, stderr, executed = run_impl(serial, cmd_with_context)
+    except EveRemoteError:
+        # Same wrapper still there (e.g. an ssh timeout): a real failure.
+        if refresh_eve_impl() is run_impl:
+            raise
+        status, stdout, stderr, executed = _RUN_IMPL(serial, cmd_with_context)
+
     return EveCommandResult(
         serial=serial,
         context=context,
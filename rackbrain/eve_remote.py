@@ -2,13 +2,58 @@ import subprocess
 import re
 import os
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 
 
 class EveRemoteError(Exception):
     """Raised when we can't successfully run eve_cmd_runner_remote.sh."""
 
 
+# Normalized wrapper script text per path, reused while
+# (st_mtime_ns, st_size) is unchanged.
+_script_cache: Dict[str, Tuple[int, int, str]] = {}
+
+_NEWLINES_RE = re.compile(r"\r\n?")
+
+# Runner status line, e.g.:
+# [eve_cmd_runner] serial=2547YW117F context=diag status=0
+# The separators are whitespace other than str.splitlines() line breaks,
+# so a search over the whole output only matches within a single line.
+_SEP = r"[^\S\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]+"
+_STATUS_LINE_RE = re.compile(
+    r"\[eve_cmd_runner\]" + _SEP + r"serial=(\S+)" + _SEP + r"context=(\S+)" + _SEP + r"status=(\d+)"
+)
+
+# _first_existing_path results, keyed on the candidate list (which already
+# reflects the env vars, CWD and HOME the search depends on).
+_path_cache: Dict[Tuple[Optional[str], ...], str] = {}
+
+
+def _first_existing_path(candidates: List[Optional[str]]) -> Optional[str]:
+    """
+    Absolute path of the first existing candidate, or None. A remembered hit
+    costs one stat (to notice the file going away) instead of one per
+    candidate; misses are not remembered.
+    """
+    cache_key = tuple(candidates)
+    cached = _path_cache.get(cache_key)
+    if cached is not None and os.path.exists(cached):
+        return cached
+
+    for candidate in candidates:
+        if not candidate:
+            continue
+        candidate = candidate.strip()
+        if not candidate:
+            continue
+        if os.path.exists(candidate):
+            found = os.path.abspath(candidate)
+            _path_cache[cache_key] = found
+            return found
+
+    return None
+
+
 def find_remote_wrapper_path() -> Optional[str]:
     """
     Locate eve_cmd_runner_remote.sh.
@@ -27,17 +72,20 @@ def find_remote_wrapper_path() -> Optional[str]:
         os.path.join(os.getcwd(), "bin", "eve_cmd_runner_remote.sh"),
         os.path.join(os.path.expanduser("~"), "bin", "eve_cmd_runner_remote.sh"),
     ]
+    return _first_existing_path(candidates)
 
-    for candidate in candidates:
-        if not candidate:
-            continue
-        candidate = candidate.strip()
-        if not candidate:
-            continue
-        if os.path.exists(candidate):
-            return os.path.abspath(candidate)
 
-    return None
+def _read_wrapper_script(script_path: str) -> str:
+    st = os.stat(script_path)
+    cached = _script_cache.get(script_path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    script_text = Path(script_path).read_text(encoding="utf-8", errors="replace")
+    # Normalize line endings so copying from Windows -> Linux doesn't break bash.
+    script_text = _NEWLINES_RE.sub("\n", script_text)
+    _script_cache[script_path] = (st.st_mtime_ns, st.st_size, script_text)
+    return script_text
 
 
 def run_eve_remote(sn: str, cmd: str, timeout: int = 600) -> Dict[str, Optional[str]]:
@@ -60,9 +108,7 @@ def run_eve_remote(sn: str, cmd: str, timeout: int = 600) -> Dict[str, Optional[
         )
 
     try:
-        script_text = Path(script_path).read_text(encoding="utf-8", errors="replace")
-        # Normalize line endings so copying from Windows -> Linux doesn't break bash.
-        script_text = script_text.replace("\r\n", "\n").replace("\r", "\n")
+        script_text = _read_wrapper_script(script_path)
     except OSError as e:
         raise EveRemoteError(f"Failed to read eve_cmd_runner_remote.sh at {script_path!r}") from e
 
@@ -72,16 +118,7 @@ def run_eve_remote(sn: str, cmd: str, timeout: int = 600) -> Dict[str, Optional[
         os.path.join(repo_root, "eve_cmd_runner.sh"),
         os.path.join(os.getcwd(), "eve_cmd_runner.sh"),
     ]
-    runner_path = None
-    for candidate in runner_path_candidates:
-        if not candidate:
-            continue
-        candidate = candidate.strip()
-        if not candidate:
-            continue
-        if os.path.exists(candidate):
-            runner_path = os.path.abspath(candidate)
-            break
+    runner_path = _first_existing_path(runner_path_candidates)
 
     try:
         proc = subprocess.run(
@@ -112,19 +149,13 @@ def run_eve_remote(sn: str, cmd: str, timeout: int = 600) -> Dict[str, Optional[
     context: Optional[str] = None
     diag_status: Optional[int] = None
 
-    # Parse the status line, e.g.:
-    # [eve_cmd_runner] serial=2547YW117F context=diag status=0
-    combined = "{}\n{}".format(stdout or "", stderr or "")
-    for line in combined.splitlines():
-        m = re.search(
-            r"\[eve_cmd_runner\]\s+serial=(\S+)\s+context=(\S+)\s+status=(\d+)",
-            line,
-        )
-        if m:
-            serial = m.group(1)
-            context = m.group(2)
-            diag_status = int(m.group(3))
-            break
+    # Parse the status line (first one in stdout, else in stderr) straight
+    # from the captured output, without joining or splitting it.
+    m = _STATUS_LINE_RE.search(stdout or "") or _STATUS_LINE_RE.search(stderr or "")
+    if m:
+        serial = m.group(1)
+        context = m.group(2)
+        diag_status = int(m.group(3))
 
 
     # If the wrapper failed before emitting a runner status line, do not raise:
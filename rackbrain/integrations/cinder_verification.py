@@ -1,10 +1,50 @@
 import json
 import os
-import subprocess
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Optional, Tuple
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
 
+import pymysql
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rackbrain.adapters.jira_client import _json_loads
+
+# Seizo execution bodies can be large; orjson is optional and only used
+# when installed (as in the Jira client, whose _json_loads also parses
+# responses here: it keeps integers wider than 64 bits exact).
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson's indented output differs from json.dumps(indent=2) only in
+# characters json.dumps escapes (non-ASCII, DEL) and in floats repr() writes
+# with an exponent, which orjson writes as "1e16" (not "1e+16") or
+# "0.000015" (not "1.5e-05"); NaN/Infinity can't occur, as _json_loads
+# rejects them when orjson is installed. Strings never contain a raw
+# newline, so such a number at the end of a line is always a float.
+_EXPONENT_FLOAT_RE = re.compile(rb"(?m)(?:e-?|0\.0000)[0-9]+,?$")
+
+# One keep-alive session for all Seizo calls; a report makes two requests
+# to the same host, so the second one reuses the first one's connection.
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# Idle outpost_fru connections per (host, user, db), reused across reports.
+_MYSQL_POOL_MAX_IDLE = 2
+_mysql_pools: Dict[Tuple[str, str, str], "queue.LifoQueue"] = {}
+_mysql_pools_lock = threading.Lock()
+
+_OUTPOST_FRU_SQL = (
+    "SELECT id, sn_tag, hex(test_passed) AS test_passed, test_finished "
+    "FROM outpost_fru WHERE sn_tag = %s"
+)
 
 
 class CinderVerificationError(RuntimeError):
@@ -52,55 +92,186 @@ def _require_mysql_password(cfg: CinderConfig) -> str:
     return pwd
 
 
-def _pretty_json(obj: Any) -> str:
-    return json.dumps(obj, indent=2, sort_keys=False)
+def _orjson_pretty(obj: Any, limit: Optional[int]) -> Optional[str]:
+    """
+    orjson's encoding of obj when it fits in `limit` and matches
+    json.dumps(obj, indent=2) exactly, else None.
+    """
+    try:
+        out = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    except TypeError:
+        # orjson.JSONEncodeError, e.g. integers wider than 64 bits.
+        return None
+    if limit is not None and len(out) > limit:
+        return None
+    if b"\x7f" in out or _EXPONENT_FLOAT_RE.search(out):
+        return None
+    try:
+        return out.decode("ascii")
+    except UnicodeDecodeError:
+        return None
 
 
-def _http_get_json(url: str, timeout_s: int) -> Tuple[Any, str]:
-    resp = requests.get(url, timeout=timeout_s)
+def _pretty_json(obj: Any, limit: Optional[int] = None) -> str:
+    """
+    json.dumps(obj, indent=2), where with `limit` encoding stops once more
+    than `limit` characters exist: the result is a prefix of the full text
+    that is all of it or longer than `limit`. orjson (when installed)
+    encodes it in C when the result fits and comes out the same.
+    """
+    if orjson is not None:
+        pretty = _orjson_pretty(obj, limit)
+        if pretty is not None:
+            return pretty
+    if limit is None:
+        return json.dumps(obj, indent=2, sort_keys=False)
+    parts = []
+    size = 0
+    for chunk in json.JSONEncoder(indent=2, sort_keys=False).iterencode(obj):
+        parts.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            break
+    return "".join(parts)
+
+
+def _get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=8,
+                max_retries=Retry(
+                    total=2,
+                    backoff_factor=0.2,
+                    status_forcelist=[502, 503, 504],
+                    # Hand the last response back so the status check below
+                    # reports it.
+                    raise_on_status=False,
+                ),
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def _http_get_json(url: str, timeout_s: int) -> Any:
+    resp = _get_session().get(url, timeout=timeout_s)
     if resp.status_code != 200:
         raise CinderVerificationError(f"HTTP {resp.status_code} from {url}: {resp.text}")
-    raw = resp.text or ""
+    # Parse the body bytes directly; the decoded text is only built for the
+    # error message.
     try:
-        return resp.json(), raw
+        return _json_loads(resp.content or b"")
     except Exception as exc:
-        raise CinderVerificationError(f"Non-JSON response from {url}: {exc}\n{raw}")
+        raise CinderVerificationError(f"Non-JSON response from {url}: {exc}\n{resp.text or ''}")
 
 
-def _mysql_outpost_fru_table(sn: str, cfg: CinderConfig) -> str:
-    pwd = _require_mysql_password(cfg)
-    safe_sn = sn.replace("'", "''")
-    sql = (
-        "SELECT id, sn_tag, hex(test_passed) AS test_passed, test_finished "
-        f"FROM outpost_fru WHERE sn_tag = '{safe_sn}';"
+def _acquire_mysql_conn(cfg: CinderConfig, pwd: str):
+    """
+    Take an idle pooled connection for cfg's server (re-validated with ping)
+    or open a new one.
+    """
+    pool = _mysql_pools.get((cfg.mysql_host, cfg.mysql_user, cfg.mysql_db))
+    while pool is not None:
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            conn.ping(reconnect=True)
+            return conn
+        except pymysql.MySQLError:
+            _close_quietly(conn)
+
+    return pymysql.connect(
+        host=cfg.mysql_host,
+        user=cfg.mysql_user,
+        password=pwd,
+        database=cfg.mysql_db,
+        charset="utf8mb4",
+        autocommit=True,
     )
-    cmd = [
-        "mysql",
-        "-h", cfg.mysql_host,
-        "-u", cfg.mysql_user,
-        "-D", cfg.mysql_db,
-        f"--password={pwd}",
-        "-t",
-        "-e", sql,
+
+
+def _release_mysql_conn(cfg: CinderConfig, conn) -> None:
+    key = (cfg.mysql_host, cfg.mysql_user, cfg.mysql_db)
+    with _mysql_pools_lock:
+        pool = _mysql_pools.setdefault(key, queue.LifoQueue(maxsize=_MYSQL_POOL_MAX_IDLE))
+    try:
+        pool.put_nowait(conn)
+    except queue.Full:
+        _close_quietly(conn)
+
+
+def _close_quietly(conn) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+def _mysql_cell(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+def _format_mysql_table(columns: List[str], rows: List[tuple]) -> str:
+    """
+    Render rows the way `mysql -t` prints them (numbers right-aligned), so
+    the report body is unchanged.
+    """
+    cells = [[_mysql_cell(v) for v in row] for row in rows]
+    numeric = [
+        all(isinstance(row[i], (int, float, Decimal)) or row[i] is None for row in rows)
+        and any(row[i] is not None for row in rows)
+        for i in range(len(columns))
     ]
+    widths = [
+        max([len(col)] + [len(row[i]) for row in cells])
+        for i, col in enumerate(columns)
+    ]
+    border = "+" + "+".join("-" * (w + 2) for w in widths) + "+"
+
+    def line(values: List[str], align_numeric: bool) -> str:
+        parts = []
+        for i, v in enumerate(values):
+            if align_numeric and numeric[i]:
+                parts.append(" " + v.rjust(widths[i]) + " ")
+            else:
+                parts.append(" " + v.ljust(widths[i]) + " ")
+        return "|" + "|".join(parts) + "|"
+
+    out = [border, line(columns, False), border]
+    out.extend(line(row, True) for row in cells)
+    out.append(border)
+    return "\n".join(out)
+
+
+def _mysql_outpost_fru_table(sn: str, cfg: CinderConfig) -> str:
+    pwd = _require_mysql_password(cfg)
+    conn = None
     try:
-        p = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            universal_newlines=True,
-            check=True,
-        )
-    except FileNotFoundError:
-        raise CinderVerificationError("mysql client not found in PATH.")
-    except subprocess.CalledProcessError as exc:
-        stderr = (exc.stderr or "").strip()
-        raise CinderVerificationError(f"mysql query failed: {stderr or exc}")
-
-    out = (p.stdout or "").rstrip()
-    if not out.strip():
+        conn = _acquire_mysql_conn(cfg, pwd)
+        with conn.cursor() as cursor:
+            cursor.execute(_OUTPOST_FRU_SQL, (sn,))
+            columns = [d[0] for d in cursor.description]
+            rows = list(cursor.fetchall())
+    except pymysql.MySQLError as exc:
+        if conn is not None:
+            _close_quietly(conn)
+        raise CinderVerificationError(f"mysql query failed: {exc}")
+    _release_mysql_conn(cfg, conn)
+
+    if not rows:
         raise CinderVerificationError(f"No outpost_fru row found for sn_tag={sn}")
-    return out
+    return _format_mysql_table(columns, rows)
 
 
 def build_cinder_verification_report(sn: str, config: Optional[CinderConfig] = None) -> str:
@@ -121,12 +292,21 @@ def build_cinder_verification_report(sn: str, config: Optional[CinderConfig] = N
     if not cfg.seizo_base:
         raise CinderVerificationError("Missing Seizo base URL (RACKBRAIN_SEIZO_BASE).")
 
-    db_block = _mysql_outpost_fru_table(sn, cfg)
-
     base = cfg.seizo_base.rstrip("/")
     list_url = f"{base}/{cfg.list_path.strip('/')}/SNX.{sn}"
-    list_obj, _ = _http_get_json(list_url, cfg.http_timeout_seconds)
-    list_pretty = _pretty_json(list_obj)
+
+    # The DB query and the execution list are independent: run them side by
+    # side. A DB failure is still the one reported when both fail.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        db_future = executor.submit(_mysql_outpost_fru_table, sn, cfg)
+        list_future = executor.submit(_http_get_json, list_url, cfg.http_timeout_seconds)
+        db_block = db_future.result()
+        list_obj = list_future.result()
+    # Only what fits in max_report_chars is pretty-printed (plus the
+    # "\n\n" separators); the rest would be cut off below anyway.
+    remaining = max(cfg.max_report_chars - len(db_block) - 2, 0)
+    list_pretty = _pretty_json(list_obj, remaining)
+    remaining = max(remaining - len(list_pretty) - 2, 0)
 
     execution_id = None
     try:
@@ -140,14 +320,18 @@ def build_cinder_verification_report(sn: str, config: Optional[CinderConfig] = N
         raise CinderVerificationError("No execution_id found.")
 
     exec_url = f"{base}/{cfg.exec_path.strip('/')}/{execution_id}"
-    exec_obj, _ = _http_get_json(exec_url, cfg.http_timeout_seconds)
-    details_block = _pretty_json(exec_obj)
+    exec_obj = _http_get_json(exec_url, cfg.http_timeout_seconds)
+    details_block = _pretty_json(exec_obj, remaining)
 
-    body = "\n\n".join([db_block, list_pretty, details_block]).rstrip()
+    body = "\n\n".join([db_block, list_pretty, details_block])
     if not body.strip():
         raise CinderVerificationError(f"Empty report for SN {sn}.")
 
     if len(body) > cfg.max_report_chars:
+        # Pretty JSON never ends in whitespace, so the full body had nothing
+        # to rstrip; cut the (possibly partial) body as before.
         body = body[: cfg.max_report_chars]
+    else:
+        body = body.rstrip()
 
     return body
@@ -1,27 +1,21 @@
+import hashlib
+import io
 import os
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Dict, Optional, Tuple
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 
 PASS_COMMENT = "Pass"
 
-# Only scan these summary markers (case/punct-insensitive), mirroring the original precheck script.
-_ALLOWED_TOKENS_RAW = ["pre-rlt", "prerlt", "precheck", "pre-check", "pre rlt", "pre check"]
-
-
-def _norm_summary(s: str) -> str:
-    s = (s or "").lower()
-    s = re.sub(r"[^a-z0-9]+", " ", s)
-    return re.sub(r"\s+", " ", s).strip()
-
-
-_ALLOWED_TOKENS = {_norm_summary(t) for t in _ALLOWED_TOKENS_RAW}
-
+# Only scan these summary markers (case/punct-insensitive), mirroring the original precheck script:
+# "pre-rlt", "prerlt", "precheck", "pre-check", "pre rlt", "pre check". As one pattern over the
+# lowered summary: "pre", any run of non-[a-z0-9] characters, then "rlt" or "check".
+_MARKER_RE = re.compile(r"pre[^a-z0-9]*(?:rlt|check)")
 
 def summary_has_precheck_marker(summary: str) -> bool:
-    ns = _norm_summary(summary)
-    return any(tok in ns for tok in _ALLOWED_TOKENS)
+    return _MARKER_RE.search((summary or "").lower()) is not None
 
 
 # ---- Fuzzy phrase matcher (ported from precheck/jiraprecheck.py; behavior preserved) ----
@@ -34,21 +28,35 @@ _ALIASES = {
 }
 
 
-def _norm_text(s: str) -> str:
-    s = (s or "").lower()
-    s = re.sub(r"[^a-z0-9]+", " ", s)
-    return re.sub(r"\s+", " ", s).strip()
+class _AlnumOnlyTable(dict):
+    """
+    str.translate table: [a-z0-9] map to themselves, every other character
+    to a space. Entries are added on first sight, so after warm-up the
+    translation runs entirely in C.
+    """
+
+    def __missing__(self, code: int) -> int:
+        ch = chr(code)
+        value = code if ("a" <= ch <= "z" or "0" <= ch <= "9") else 32
+        self[code] = value
+        return value
+
+
+_ALNUM_ONLY = _AlnumOnlyTable()
 
 
 def _tokenize(text: str):
-    return _norm_text(text).split()
+    # The [a-z0-9] runs of the lowered text.
+    return (text or "").lower().translate(_ALNUM_ONLY).split()
 
 
-def _canonicalize(tok: str) -> str:
-    for k, forms in _ALIASES.items():
-        if tok in forms:
-            return k
-    return tok
+# Small int id per allowed token, with every alias form mapped to its
+# canonical token's id; REQUIRED tokens seen so far are then one bitmask.
+_TOKEN_IDS = {tok: i for i, tok in enumerate(sorted(_REQUIRED | _OPTIONAL))}
+_TOKEN_IDS.update(
+    {form: _TOKEN_IDS[canon] for canon, forms in _ALIASES.items() for form in forms}
+)
+_REQUIRED_MASK = sum(1 << _TOKEN_IDS[tok] for tok in _REQUIRED)
 
 
 def text_has_target_line(text: str) -> bool:
@@ -59,45 +67,37 @@ def text_has_target_line(text: str) -> bool:
       * and contains NO other tokens.
     Order within the window does not matter.
     """
-    toks = [_canonicalize(t) for t in _tokenize(text)]
-
-    if not _REQUIRED.issubset({_canonicalize(t) for t in _tokenize(text)}):
-        return False
-
-    allowed = _REQUIRED | _OPTIONAL
-    need_n = len(_REQUIRED)
-
-    left = 0
-    counts: Dict[str, int] = {}
-    have = 0
-
-    def add(tok: str):
-        nonlocal have
-        counts[tok] = counts.get(tok, 0) + 1
-        if tok in _REQUIRED and counts[tok] == 1:
-            have += 1
-
-    for right, tok in enumerate(toks):
-        add(tok)
-
-        if tok not in allowed:
-            counts.clear()
-            have = 0
-            left = right + 1
+    token_ids = _TOKEN_IDS
+    # REQUIRED/OPTIONAL tokens seen since the last other token.
+    seen = 0
+    for tok in _tokenize(text):
+        tid = token_ids.get(tok)
+        if tid is None:
+            seen = 0
             continue
-
-        if have == need_n and left <= right:
+        seen |= 1 << tid
+        if seen & _REQUIRED_MASK == _REQUIRED_MASK:
             return True
-
     return False
 
 
 _IMG_MIME_RE = re.compile(r"^image/")
+# Characters replaced by "_" in attachment names used for logs/debug files.
+_SAFE_NAME_RE = re.compile(r"[^a-zA-Z0-9_.-]")
+# Vector images: Pillow can't decode them, so they are never downloaded.
+_SKIP_IMAGE_MIMES = ("image/svg+xml",)
+_SKIP_IMAGE_EXTS = (".svg", ".svgz")
+
+# Image attachments larger than this (Jira "size", bytes) are not OCRed;
+# 0 disables the limit.
+DEFAULT_OCR_MAX_BYTES = 10 * 1024 * 1024
 
 
 def _attachment_is_image(att: Dict[str, Any]) -> bool:
     mime = str(att.get("mimeType") or "").lower()
     filename = str(att.get("filename") or "").lower()
+    if mime in _SKIP_IMAGE_MIMES or filename.endswith(_SKIP_IMAGE_EXTS):
+        return False
     if _IMG_MIME_RE.match(mime):
         return True
     for ext in (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp"):
@@ -106,6 +106,13 @@ def _attachment_is_image(att: Dict[str, Any]) -> bool:
     return False
 
 
+def _attachment_size(att: Dict[str, Any]) -> Optional[int]:
+    try:
+        return int(att.get("size"))
+    except (TypeError, ValueError):
+        return None
+
+
 def _ocr_debug_enabled() -> bool:
     return os.getenv("JIRA_OCR_DEBUG", "0").lower() not in ("0", "false", "")
 
@@ -127,22 +134,75 @@ def _dbg_write(name: str, content: str) -> None:
         print(f"[DEBUG] failed to write debug file {name}: {exc}")
 
 
+# Smallest size a JPEG attachment is decoded at (Image.draft); larger
+# screenshots are decoded at 1/2, 1/4 or 1/8 scale instead of full size.
+_OCR_DRAFT_SIZE = (2048, 2048)
+
+# One RapidOCR (and so one set of ONNX Runtime sessions) shared by all
+# attachment workers; inference releases the GIL, so workers still overlap.
 _rapid_ocr = None
+_rapid_ocr_lock = threading.Lock()
 
 
 def _get_rapid_ocr():
     global _rapid_ocr
     if _rapid_ocr is None:
-        from rapidocr_onnxruntime import RapidOCR
-
-        _rapid_ocr = RapidOCR()
+        # Workers start together; load the models only once.
+        with _rapid_ocr_lock:
+            if _rapid_ocr is None:
+                from rapidocr_onnxruntime import RapidOCR
+
+                # Optional RapidOCR config.yaml, e.g. pointing Det/Rec
+                # model_path at int8-quantized models for faster CPU OCR.
+                config_path = os.getenv("RACKBRAIN_OCR_CONFIG_PATH", "").strip()
+                _rapid_ocr = RapidOCR(config_path) if config_path else RapidOCR()
     return _rapid_ocr
 
 
-def _ocr_image_bytes(img_bytes: bytes, *, dump_basename: Optional[str] = None) -> str:
+# _ocr_image_bytes results per (sha1 of the image bytes, match_fn), so a
+# ticket that is processed again doesn't OCR the same attachments again.
+# Oldest entries are dropped first.
+OCR_CACHE_MAX_ENTRIES = 256
+_ocr_cache: Dict[Tuple[str, Any], str] = {}
+_ocr_cache_lock = threading.Lock()
+
+
+def _ocr_image_bytes(
+    img_bytes: bytes,
+    *,
+    match_fn: Optional[Callable[[str], bool]] = None,
+    dump_basename: Optional[str] = None,
+) -> str:
+    """
+    OCR text of an image at 1.0x and 1.75x, joined. With match_fn, a scale
+    whose text satisfies it is returned on its own and the remaining
+    (larger) scales are skipped.
+    """
     if not img_bytes:
         return ""
 
+    cache_key = (hashlib.sha1(img_bytes).hexdigest(), match_fn)
+    with _ocr_cache_lock:
+        cached = _ocr_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    text = _ocr_image_bytes_uncached(img_bytes, match_fn=match_fn, dump_basename=dump_basename)
+
+    with _ocr_cache_lock:
+        _ocr_cache.pop(cache_key, None)
+        while len(_ocr_cache) >= OCR_CACHE_MAX_ENTRIES:
+            del _ocr_cache[next(iter(_ocr_cache))]
+        _ocr_cache[cache_key] = text
+    return text
+
+
+def _ocr_image_bytes_uncached(
+    img_bytes: bytes,
+    *,
+    match_fn: Optional[Callable[[str], bool]],
+    dump_basename: Optional[str],
+) -> str:
     try:
         from PIL import Image
         import numpy as np
@@ -152,7 +212,13 @@ def _ocr_image_bytes(img_bytes: bytes, *, dump_basename: Optional[str] = None) -
         ) from exc
 
     try:
-        img = Image.open(__import__("io").BytesIO(img_bytes)).convert("RGB")
+        img = Image.open(io.BytesIO(img_bytes))
+        # JPEGs decode straight to RGB, and at a reduced DCT scale when still
+        # at least _OCR_DRAFT_SIZE; other formats ignore this.
+        img.draft("RGB", _OCR_DRAFT_SIZE)
+        img.load()
+        if img.mode != "RGB":
+            img = img.convert("RGB")
     except Exception:
         return ""
 
@@ -174,12 +240,52 @@ def _ocr_image_bytes(img_bytes: bytes, *, dump_basename: Optional[str] = None) -
                 texts.append(chunk)
                 if dump_basename:
                     _dbg_write(f"{dump_basename}_scale_{scale}.txt", chunk)
+                if match_fn is not None and match_fn(chunk):
+                    return chunk.strip()
         except Exception:
             continue
 
     return "\n".join(texts).strip()
 
 
+# Attachment workers shared by all populate_precheck_context calls, so
+# threads are started once and concurrent calls share the same OCR cap.
+_ocr_pool: Optional[ThreadPoolExecutor] = None
+_ocr_pool_lock = threading.Lock()
+
+
+def _get_ocr_pool() -> ThreadPoolExecutor:
+    global _ocr_pool
+    if _ocr_pool is None:
+        with _ocr_pool_lock:
+            if _ocr_pool is None:
+                max_workers = int(os.getenv("RACKBRAIN_PRECHECK_MAX_ATTACHMENT_WORKERS", "2"))
+                _ocr_pool = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="precheck-ocr"
+                )
+    return _ocr_pool
+
+
+# Attachment downloads run on their own, wider pool: they are network bound
+# and share the Jira client's keep-alive session, so the OCR workers above
+# mostly find their bytes already fetched instead of each waiting on one
+# download at a time.
+_download_pool: Optional[ThreadPoolExecutor] = None
+_download_pool_lock = threading.Lock()
+
+
+def _get_download_pool() -> ThreadPoolExecutor:
+    global _download_pool
+    if _download_pool is None:
+        with _download_pool_lock:
+            if _download_pool is None:
+                max_workers = int(os.getenv("RACKBRAIN_PRECHECK_MAX_DOWNLOAD_WORKERS", "4"))
+                _download_pool = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="precheck-download"
+                )
+    return _download_pool
+
+
 def populate_precheck_context(*, error_event: Any, jira: Any) -> None:
     """
     Populate precheck-specific fields on ErrorEvent.
@@ -231,42 +337,89 @@ def populate_precheck_context(*, error_event: Any, jira: Any) -> None:
         return
 
     # Performance knobs (mirror precheck script defaults)
-    max_workers = int(os.getenv("RACKBRAIN_PRECHECK_MAX_ATTACHMENT_WORKERS", "2"))
+    max_bytes = int(os.getenv("RACKBRAIN_OCR_MAX_BYTES", str(DEFAULT_OCR_MAX_BYTES)))
+
+    # Only image attachments within max_bytes, each (filename, size) once,
+    # smallest first: with the first-match break below, an answer usually
+    # comes after fewer downloaded bytes.
+    candidates = []
+    seen = set()
+    for idx, att in enumerate(atts):
+        if not isinstance(att, dict) or not _attachment_is_image(att):
+            continue
+        size = _attachment_size(att)
+        if size is not None:
+            if max_bytes > 0 and size > max_bytes:
+                continue
+            ident = (att.get("filename"), size)
+            if ident in seen:
+                continue
+            seen.add(ident)
+        candidates.append((size is None, size or 0, idx, att))
+    candidates.sort(key=lambda c: c[:3])
 
-    def _scan_one(att: Dict[str, Any]) -> Tuple[bool, str]:
-        if not _attachment_is_image(att):
-            return (False, "")
+    if not candidates:
+        setattr(error_event, "precheck_phrase_found", False)
+        setattr(error_event, "precheck_phrase_source", None)
+        return
+
+    # Set once the answer is known (or the scan is abandoned); running scans
+    # check it before their download and before their OCR.
+    stop = threading.Event()
+
+    def _download(url: str) -> Optional[bytes]:
+        if stop.is_set():
+            return None
+        return jira.download_url_bytes(url)
 
-        url = att.get("content") or ""
-        if not url:
+    def _scan_one(att: Dict[str, Any], download: Optional[Future]) -> Tuple[bool, str]:
+        if stop.is_set() or download is None:
             return (False, "")
 
         try:
-            content = jira.download_url_bytes(str(url))
+            content = download.result()
         except Exception as exc:
             if _ocr_debug_enabled():
                 print(f"[WARN] precheck: attachment download failed: {att.get('filename')}: {exc}")
             return (False, "")
+        if content is None or stop.is_set():
+            return (False, "")
 
-        safe_name = re.sub(r"[^a-zA-Z0-9_.-]", "_", str(att.get("filename") or "attachment"))
+        safe_name = _SAFE_NAME_RE.sub("_", str(att.get("filename") or "attachment"))
         dump_base = None
         if _ocr_debug_enabled():
             key = getattr(getattr(error_event, "ticket", None), "key", "") or "UNKNOWN"
             dump_base = f"{key}_{safe_name}"
 
-        txt = _ocr_image_bytes(content, dump_basename=dump_base)
+        txt = _ocr_image_bytes(content, match_fn=text_has_target_line, dump_basename=dump_base)
         if txt and text_has_target_line(txt):
             return (True, safe_name)
         return (False, "")
 
+    # Downloads are queued in scan order, ahead of the OCR that needs them.
+    downloads: List[Optional[Future]] = []
+    for c in candidates:
+        url = c[3].get("content") or ""
+        downloads.append(_get_download_pool().submit(_download, str(url)) if url else None)
+
     matched_attachment = None
-    with ThreadPoolExecutor(max_workers=max_workers) as pool:
-        futures = [pool.submit(_scan_one, a) for a in atts]
+    futures = [
+        _get_ocr_pool().submit(_scan_one, c[3], download)
+        for c, download in zip(candidates, downloads)
+    ]
+    try:
         for fut in as_completed(futures):
             ok, name = fut.result()
             if ok:
                 matched_attachment = name or "attachment"
                 break
+    finally:
+        # Attachments not started yet are no longer needed; ones already
+        # running skip whatever download/OCR they haven't begun.
+        stop.set()
+        for fut in futures + downloads:
+            if fut is not None:
+                fut.cancel()
 
     if matched_attachment:
         setattr(error_event, "precheck_phrase_found", True)
@@ -1,9 +1,67 @@
-from typing import List, Optional
+import re
+from itertools import compress
+from typing import Any, Dict, FrozenSet, List, Optional
 
+from rackbrain.core.jira_extractors import _LINE_BREAKS, _LINE_BREAK_RE
 from rackbrain.core.models import RuleCommandStep, CommandResult
 from rackbrain.eve_command_runner import run_eve_command, EveCommandResult
 from rackbrain.services.comment_renderer import _apply_text_extracts
 
+try:
+    # Optional (pyahocorasick): checks long expect_* token lists in one pass.
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Below this many expect_* tokens, one `in` per token is faster than an
+# automaton pass (measured on multi-MB stdout).
+EXPECT_AUTOMATON_MIN_TOKENS = 8
+_expect_automata: Dict[FrozenSet[str], Any] = {}
+_EXPECT_AUTOMATA_MAX = 256
+
+
+def _expect_automaton(tokens: List[str]) -> Any:
+    """
+    Aho-Corasick automaton over `tokens`, or None when pyahocorasick is not
+    installed or there are too few tokens for one pass to beat one str.find
+    per token.
+    """
+    if ahocorasick is None or len(tokens) < EXPECT_AUTOMATON_MIN_TOKENS:
+        return None
+    key = frozenset(tokens)
+    automaton = _expect_automata.get(key)
+    if automaton is None:
+        automaton = ahocorasick.Automaton()
+        for token in key:
+            automaton.add_word(token, token)
+        automaton.make_automaton()
+        if len(_expect_automata) >= _EXPECT_AUTOMATA_MAX:
+            _expect_automata.clear()
+        _expect_automata[key] = automaton
+    return automaton
+
+
+def _contains_all(text: str, tokens: List[str]) -> bool:
+    automaton = _expect_automaton(tokens)
+    if automaton is None:
+        return all(token in text for token in tokens)
+    # The automaton reports overlapping hits too, so every token is seen.
+    missing = set(tokens)
+    for _, token in automaton.iter(text):
+        missing.discard(token)
+        if not missing:
+            return True
+    return False
+
+
+def _contains_any(text: str, tokens: List[str]) -> bool:
+    automaton = _expect_automaton(tokens)
+    if automaton is None:
+        return any(token in text for token in tokens)
+    for _ in automaton.iter(text):
+        return True
+    return False
+
 
 def _select_inline_fragments(
     lines, between_start, between_end, after_contains, after_chars
@@ -38,6 +96,42 @@ def _select_inline_fragments(
     return fragments
 
 
+# Line breaks other than "\n" (str.splitlines() boundaries, "\r\n" included).
+_NON_LF_BREAK_RE = re.compile("[" + _LINE_BREAKS.replace("\n", "") + "]")
+
+
+def _select_span(stdout: str, start_marker: str, end_marker: str) -> Optional[str]:
+    """
+    Lines from the first one containing start_marker through the first one
+    (from there on) containing end_marker, joined with "\n", as
+    _select_lines would pick them, but found with str.find on the raw
+    output instead of splitting it. None when a marker holds a line break
+    (the caller then takes the general path).
+    """
+    if _LINE_BREAK_RE.search(start_marker) or _LINE_BREAK_RE.search(end_marker):
+        return None
+
+    hit = stdout.find(start_marker)
+    if hit < 0:
+        return ""
+    # Start of the hit's line: past the last "\n", then past any rarer
+    # str.splitlines() line break after it.
+    line_start = stdout.rfind("\n", 0, hit) + 1
+    for m in _LINE_BREAK_RE.finditer(stdout, line_start, hit):
+        line_start = m.end()
+
+    end_hit = stdout.find(end_marker, line_start)
+    if end_hit < 0:
+        return ""
+    m = _LINE_BREAK_RE.search(stdout, end_hit + len(end_marker))
+    span = stdout[line_start:len(stdout) if m is None else m.start()]
+
+    if _NON_LF_BREAK_RE.search(span):
+        # Same line boundaries and "\n" joins as the general path.
+        return "\n".join(span.splitlines())
+    return span
+
+
 def _select_lines(stdout: str, step: RuleCommandStep) -> str:
     """
     Return a subset of stdout based on the step's line_* and between_* settings.
@@ -60,7 +154,6 @@ def _select_lines(stdout: str, step: RuleCommandStep) -> str:
     if not stdout:
         return ""
 
-    lines = stdout.splitlines()
     not_contains = getattr(step, "line_not_contains", None)
 
     inline_start = getattr(step, "line_between_start_contains", None)
@@ -68,6 +161,19 @@ def _select_lines(stdout: str, step: RuleCommandStep) -> str:
     inline_after = getattr(step, "line_after_contains", None)
     inline_after_chars = getattr(step, "line_after_chars", 0)
     has_inline = bool((inline_start and inline_end) or inline_after)
+
+    if (
+        not has_inline
+        and not step.line_contains
+        and not not_contains
+        and step.between_start_contains
+        and step.between_end_contains
+    ):
+        span = _select_span(stdout, step.between_start_contains, step.between_end_contains)
+        if span is not None:
+            return span
+
+    lines = stdout.splitlines()
     if has_inline:
         fragments = _select_inline_fragments(
             lines,
@@ -78,52 +184,53 @@ def _select_lines(stdout: str, step: RuleCommandStep) -> str:
         )
         return "\n".join(fragments) if fragments else ""
 
-    selected_idx = set()
+    # One flag per line; spans and context windows are set by slice, and the
+    # result is read back in line order (no index set to sort).
+    n = len(lines)
+    selected = bytearray(n)
 
     # 1) Span selection between two markers
-    if step.between_start_contains and step.between_end_contains:
+    # (step fields are read once into locals, not per line)
+    start_marker = step.between_start_contains
+    end_marker = step.between_end_contains
+    if start_marker and end_marker:
         start_idx = None
         end_idx = None
         for i, line in enumerate(lines):
-            if start_idx is None and step.between_start_contains in line:
+            if start_idx is None and start_marker in line:
                 start_idx = i
-            if start_idx is not None and step.between_end_contains in line:
+            if start_idx is not None and end_marker in line:
                 end_idx = i
                 break
         if start_idx is not None and end_idx is not None and end_idx >= start_idx:
-            for j in range(start_idx, end_idx + 1):
-                selected_idx.add(j)
+            selected[start_idx:end_idx + 1] = b"\x01" * (end_idx + 1 - start_idx)
 
     # 2) Per-line contains + context (or only matching lines)
     if step.line_contains:
+        needle = step.line_contains
         if step.line_only:
             # Only matching lines, no context
-            for i, line in enumerate(lines):
-                if step.line_contains in line and (not not_contains or not_contains not in line):
-                    selected_idx.add(i)
+            before = after = 0
         else:
             # Matching lines with context
             before = step.line_before or 0
             after = step.line_after or 0
-            for i, line in enumerate(lines):
-                if step.line_contains in line and (not not_contains or not_contains not in line):
-                    start = max(0, i - before)
-                    end = min(len(lines), i + after + 1)
-                    for j in range(start, end):
-                        selected_idx.add(j)
-
-    # 3) Negative-only selection: lines that do NOT contain a substring
-    if not selected_idx and not_contains and not step.line_contains:
         for i, line in enumerate(lines):
-            if not_contains not in line:
-                selected_idx.add(i)
+            if needle in line and (not not_contains or not_contains not in line):
+                start = max(0, i - before)
+                end = min(n, i + after + 1)
+                if end > start:
+                    selected[start:end] = b"\x01" * (end - start)
 
-    if not selected_idx:
+    # 3) Negative-only selection: lines that do NOT contain a substring
+    if 1 not in selected:
+        if not_contains and not step.line_contains:
+            return "\n".join([line for line in lines if not_contains not in line])
         return ""
 
-    ordered_lines = [lines[i] for i in sorted(selected_idx)]
+    ordered_lines = compress(lines, selected)
     if not_contains:
-        ordered_lines = [line for line in ordered_lines if not_contains not in line]
+        return "\n".join([line for line in ordered_lines if not_contains not in line])
     return "\n".join(ordered_lines)
 
 
@@ -163,6 +270,11 @@ def execute_command_steps(error_event, action, skip_commands: bool = False):
                 return candidate
         return str(value).strip()
 
+    # ("{name}", name) per extract, and each placeholder's substitution once
+    # some step has used it; extracts don't change while the steps run.
+    extract_placeholders = [("{" + str(name) + "}", name) for name in extracts]
+    extract_first_lines: Dict[str, str] = {}
+
     def _items_from_extract(extract_name: str) -> List[str]:
         raw = extracts.get(extract_name) or ""
         items = []
@@ -257,10 +369,14 @@ def execute_command_steps(error_event, action, skip_commands: bool = False):
 
         # Allow using action-level `text_extracts` variables inside command strings.
         # Example: cmd: "{ilom} {ilom_failed_cmd}"
-        for extract_name, extract_value in extracts.items():
-            placeholder = "{" + str(extract_name) + "}"
-            if placeholder in cmd_str:
-                cmd_str = cmd_str.replace(placeholder, _first_nonempty_line(extract_value))
+        if "{" in cmd_str:
+            for placeholder, extract_name in extract_placeholders:
+                if placeholder in cmd_str:
+                    value = extract_first_lines.get(placeholder)
+                    if value is None:
+                        value = _first_nonempty_line(extracts[extract_name])
+                        extract_first_lines[placeholder] = value
+                    cmd_str = cmd_str.replace(placeholder, value)
 
         def _as_tokens(value: object) -> List[str]:
             if value is None:
@@ -269,19 +385,21 @@ def execute_command_steps(error_event, action, skip_commands: bool = False):
                 return [str(v) for v in value if v is not None and str(v)]
             return [str(value)] if str(value) else []
 
+        # Same for every result of this step (for_each_extract runs it often).
+        contains_tokens = _as_tokens(step.expect_contains)
+        not_contains_tokens = _as_tokens(step.expect_not_contains)
+
         def _evaluate_expectations(result: EveCommandResult) -> bool:
             stdout = result.stdout or ""
             status_ok = step.expect_status is None or result.status == step.expect_status
+            if not status_ok:
+                return False
 
-            contains_tokens = _as_tokens(step.expect_contains)
-            contains_ok = (not contains_tokens) or all(token in stdout for token in contains_tokens)
-
-            not_contains_tokens = _as_tokens(step.expect_not_contains)
-            not_contains_ok = (not not_contains_tokens) or all(
-                token not in stdout for token in not_contains_tokens
-            )
+            contains_ok = (not contains_tokens) or _contains_all(stdout, contains_tokens)
+            if not contains_ok:
+                return False
 
-            return status_ok and contains_ok and not_contains_ok
+            return (not not_contains_tokens) or not _contains_any(stdout, not_contains_tokens)
 
         # Loop expansion: run this step once per extracted item.
         for_each_name = getattr(step, "for_each_extract", None)
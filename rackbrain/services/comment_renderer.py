@@ -1,3 +1,4 @@
+from itertools import compress
 from typing import Dict, List, Optional, Tuple
 
 
@@ -193,7 +194,9 @@ def _select_failure_message_lines(error_event, action) -> str:
         )
         return "\n".join(fragments) if fragments else ""
 
-    selected_idx = set()
+    # One flag per line, as in command_steps._select_lines.
+    n = len(lines)
+    selected = bytearray(n)
 
     # 1) Span selection between two markers
     start_sub = getattr(action, "failure_message_between_start_contains", None)
@@ -209,8 +212,7 @@ def _select_failure_message_lines(error_event, action) -> str:
                 end_idx = i
                 break
         if start_idx is not None and end_idx is not None and end_idx >= start_idx:
-            for j in range(start_idx, end_idx + 1):
-                selected_idx.add(j)
+            selected[start_idx:end_idx + 1] = b"\x01" * (end_idx + 1 - start_idx)
 
     # 2) Per-line contains + context
     line_sub = getattr(action, "failure_message_line_contains", None)
@@ -221,15 +223,14 @@ def _select_failure_message_lines(error_event, action) -> str:
         for i, line in enumerate(lines):
             if line_sub in line:
                 start = max(0, i - before)
-                end = min(len(lines), i + after + 1)
-                for j in range(start, end):
-                    selected_idx.add(j)
+                end = min(n, i + after + 1)
+                if end > start:
+                    selected[start:end] = b"\x01" * (end - start)
 
-    if not selected_idx:
+    if 1 not in selected:
         return ""
 
-    ordered_lines = [lines[i] for i in sorted(selected_idx)]
-    return "\n".join(ordered_lines)
+    return "\n".join(compress(lines, selected))
 
 
 def _format_command_history(command_history) -> str:
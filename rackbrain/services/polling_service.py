@@ -21,7 +21,11 @@ from datetime import datetime
 
 from rackbrain.adapters.jira_client import JiraClient
 from rackbrain.core.models import Rule
-from rackbrain.services.ticket_processor import process_ticket
+from rackbrain.services.ticket_processor import (
+    ISSUE_FIELDS,
+    prefetch_ticket_lookups,
+    process_ticket,
+)
 
 
 def build_default_jql(
@@ -53,6 +57,7 @@ def process_ticket_safe(
     dry_run: bool,
     skip_commands: bool,
     processing_config: Optional[Dict[str, Any]] = None,
+    issue: Optional[Dict[str, Any]] = None,
 ):
     try:
         # process_ticket already returns an outcome dict with "edited"
@@ -63,6 +68,7 @@ def process_ticket_safe(
             dry_run=dry_run,
             skip_commands=skip_commands,
             processing_config=processing_config,
+            issue=issue,
         )
 
         return {
@@ -103,9 +109,12 @@ def poll_and_process(
     edited_issue_keys = []
     name_suffix = f" ({query_name})" if query_name else ""
     print(f"[INFO] Searching for tickets{name_suffix} with JQL: {jql}")
+    # Only keys are used from the search; issue details come from the
+    # bulk fetch below with ISSUE_FIELDS. Jira always returns id/key, so
+    # this keeps each search hit to a few bytes.
     issues = jira.search_issues(
         jql=jql,
-        fields=["key", "summary", "status"],
+        fields=["key"],
         max_results=max_results,
     )
 
@@ -138,6 +147,25 @@ def poll_and_process(
     failed = 0
     processed_issue_keys: List[str] = []
 
+    # Fetch full issue payloads with a few `key in (...)` searches instead
+    # of one GET per ticket. On failure each ticket fetches its own issue.
+    try:
+        prefetched = jira.get_issues_bulk(
+            [i.get("key") for i in issues],
+            fields=ISSUE_FIELDS,
+        )
+    except Exception as exc:
+        print(f"[WARN] Bulk issue fetch failed, falling back to per-ticket fetch: {exc}")
+        prefetched = {}
+
+    # One bulk DB query and concurrent ILOM fetches for all tickets instead
+    # of one of each per ticket; process_ticket finds them already cached.
+    if prefetched:
+        try:
+            prefetch_ticket_lookups(list(prefetched.values()), processing_config)
+        except Exception as exc:
+            print(f"[WARN] Bulk DB/ILOM prefetch failed, falling back to per-ticket lookups: {exc}")
+
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {
             executor.submit(
@@ -148,6 +176,7 @@ def poll_and_process(
                 dry_run,
                 skip_commands,
                 processing_config,
+                prefetched.get(issue.get("key")),
             ): issue.get("key")
             for issue in issues
         }
@@ -178,8 +178,17 @@ def select_testview_case_template(error_event, action) -> Optional[str]:
     full_text = getattr(error_event, "testview_log_text", "") or ""
     default_snippet = getattr(error_event, "testview_log_snippet", "") or ""
 
+    # Cases usually test the same log text (or snippet); lower each haystack
+    # once rather than once per case.
+    lowered: Dict[str, str] = {}
+
     def _match_contains(haystack: str, needle: str) -> bool:
-        return str(needle).lower() in str(haystack).lower()
+        haystack = str(haystack)
+        haystack_lower = lowered.get(haystack)
+        if haystack_lower is None:
+            haystack_lower = haystack.lower()
+            lowered[haystack] = haystack_lower
+        return str(needle).lower() in haystack_lower
 
     def _match_regex(haystack: str, pattern: str) -> bool:
         try:
@@ -19,10 +19,10 @@ import re
 from copy import copy
 from typing import Dict, Any, Optional, List, Tuple
 
-from rackbrain.adapters.jira_client import JiraClient
+from rackbrain.adapters.jira_client import JiraClient, JiraTransitionError
 from rackbrain.core.classification import classify_error
-from rackbrain.core.context_builder import build_error_event, build_ticket
-from rackbrain.core.models import Rule
+from rackbrain.core.context_builder import build_error_event, build_ticket, prefetch_lookups
+from rackbrain.core.models import Rule, Ticket
 from rackbrain.core.jira_extractors import extract_option_value
 
 from rackbrain.services.command_steps import execute_command_steps
@@ -47,6 +47,27 @@ from rackbrain.integrations.precheck import (
 # Default max SLT attempts gate.
 DEFAULT_MAX_SLT_ATTEMPTS = 15
 
+# Workflow states ((project, issuetype, status), see _transitions_cache_key)
+# whose transition screen rejected the combined assign + transition + comment
+# POST; those go straight to separate calls for the rest of the process.
+_COMBINED_TRANSITION_REJECTED: set = set()
+
+# Issue fields process_ticket reads. Callers that prefetch issues in bulk
+# (see polling_service) must request the same set.
+ISSUE_FIELDS = [
+    "summary",
+    "description",
+    "status",
+    "issuetype",
+    "assignee",
+    "reporter",
+    "updated",
+    "comment",
+    "attachment",
+    "customfield_15119",  # Customer (EVE)
+    "customfield_15143",  # Location (Fremont)
+]
+
 
 # -----------------------------------------------------------------------------
 # Helpers (merged)
@@ -85,6 +106,41 @@ def _is_precheck_ticket(issue: Dict[str, Any]) -> bool:
     return summary_has_precheck_marker(summary)
 
 
+def _missing_required_text(
+    issue: Dict[str, Any], ticket: Ticket, processing_config: Optional[Dict[str, Any]]
+) -> Optional[str]:
+    """
+    The configured required_combined_text_contains when the ticket's summary
+    and description lack it (process_ticket then skips the ticket), else
+    None. Cinder and precheck tickets are never skipped.
+    """
+    required_text = None
+    if processing_config:
+        required_text = processing_config.get("required_combined_text_contains")
+    if not required_text or _is_cinder_verification_ticket(issue) or _is_precheck_ticket(issue):
+        return None
+    combined_text = (ticket.summary or "") + "\n\n" + (ticket.description or "")
+    if str(required_text).strip().lower() in combined_text.lower():
+        return None
+    return required_text
+
+
+def prefetch_ticket_lookups(
+    issues: List[Dict[str, Any]], processing_config: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Do the DB / ILOM lookups for issues about to go through process_ticket
+    in one batch (see context_builder.prefetch_lookups), skipping issues
+    process_ticket skips before building an ErrorEvent.
+    """
+    tickets = []
+    for issue in issues:
+        ticket = build_ticket(issue)
+        if _missing_required_text(issue, ticket, processing_config) is None:
+            tickets.append(ticket)
+    prefetch_lookups(tickets)
+
+
 def _find_transition_id(
     transitions: List[Dict[str, Any]], target_name: str
 ) -> Tuple[Optional[str], Optional[str]]:
@@ -96,6 +152,21 @@ def _find_transition_id(
     return (None, None)
 
 
+def _transitions_cache_key(issue: Dict[str, Any]) -> Optional[Tuple[str, str, str]]:
+    """
+    (project, issuetype, status) for JiraClient.get_transitions(cache_key=...),
+    or None when the payload does not carry all three.
+    """
+    key = str(issue.get("key") or "")
+    fields = issue.get("fields", {}) or {}
+    project = key.rsplit("-", 1)[0] if "-" in key else ""
+    issuetype = str((fields.get("issuetype") or {}).get("id") or "")
+    status = str((fields.get("status") or {}).get("id") or "")
+    if not (project and issuetype and status):
+        return None
+    return (project, issuetype, status)
+
+
 def _try_transition_by_name(
     jira: JiraClient,
     issue_key: str,
@@ -103,12 +174,32 @@ def _try_transition_by_name(
     *,
     comment_body: Optional[str] = None,
     fields: Optional[Dict[str, Any]] = None,
+    assignee: Optional[str] = None,
+    cache_key: Optional[Tuple[str, str, str]] = None,
 ) -> Tuple[bool, str]:
+    if cache_key is not None:
+        transitions = jira.get_transitions(issue_key, cache_key=cache_key)
+        tid, tname = _find_transition_id(transitions, target_name)
+        if tid:
+            try:
+                jira.do_transition(
+                    issue_key, tid, comment_body=comment_body, fields=fields, assignee=assignee
+                )
+                return (True, tname or target_name)
+            except JiraTransitionError as exc:
+                # Only a rejected request (nothing changed) is safe to send
+                # again; after a timeout or 5xx Jira may have applied it.
+                if exc.status_code not in (400, 404):
+                    raise
+        # Cached list may be stale (workflow edited, status changed since the
+        # issue was fetched): drop it and resolve against the live issue.
+        jira.invalidate_transitions(cache_key)
+
     transitions = jira.get_transitions(issue_key)
     tid, tname = _find_transition_id(transitions, target_name)
     if not tid:
         return (False, f"NOT_FOUND: {target_name}")
-    jira.do_transition(issue_key, tid, comment_body=comment_body, fields=fields)
+    jira.do_transition(issue_key, tid, comment_body=comment_body, fields=fields, assignee=assignee)
     return (True, tname or target_name)
 
 
@@ -297,8 +388,12 @@ def process_ticket(
     dry_run: bool = True,
     skip_commands: bool = False,
     processing_config: Optional[Dict[str, Any]] = None,
+    issue: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
+    `issue` may be a payload already fetched with ISSUE_FIELDS (e.g. by
+    JiraClient.get_issues_bulk); otherwise the issue is fetched here.
+
     DRY RUN:
       - does not modify Jira; prints suggested comment
 
@@ -320,21 +415,8 @@ def process_ticket(
     if processing_config and processing_config.get("max_slt_attempts") is not None:
         max_slt_attempts = int(processing_config["max_slt_attempts"])
 
-    issue = jira.get_issue(
-        issue_key,
-        fields=[
-            "summary",
-            "description",
-            "status",
-            "assignee",
-            "reporter",
-            "updated",
-            "comment",
-            "attachment",
-            "customfield_15119",  # Customer (EVE)
-            "customfield_15143",  # Location (Fremont)
-        ],
-    )
+    if issue is None:
+        issue = jira.get_issue(issue_key, fields=ISSUE_FIELDS)
 
     # Jira may truncate comments in the issue payload; fetch the last comment when needed
     try:
@@ -372,41 +454,36 @@ def process_ticket(
     is_precheck_ticket = _is_precheck_ticket(issue)
 
     # required marker filter (bypass for cinder & precheck tickets)
-    required_text = None
-    if processing_config:
-        required_text = processing_config.get("required_combined_text_contains")
-
-    if required_text and (not is_cinder_ticket) and (not is_precheck_ticket):
-        combined_text = (ticket.summary or "") + "\n\n" + (ticket.description or "")
-        if str(required_text).strip().lower() not in combined_text.lower():
-            print(
-                "[INFO] Ticket %s does not contain required marker text (%s). Skipping RackBrain processing."
-                % (issue_key, required_text)
-            )
-            logger = get_logger()
-            if logger:
-                logger.log_processed(
-                    issue_key=issue_key,
-                    success=True,
-                    dry_run=dry_run,
-                    actions_taken={
-                        "action": "skipped_missing_required_combined_text",
-                        "required_combined_text_contains": required_text,
-                    },
-                )
-            return {
-                "issue_key": issue_key,
-                "match": False,
-                "rule_id": None,
-                "rule_name": None,
-                "confidence": None,
-                "edited": False,
-                "dry_run": dry_run,
-                "actions_taken": {
+    required_text = _missing_required_text(issue, ticket, processing_config)
+    if required_text is not None:
+        print(
+            "[INFO] Ticket %s does not contain required marker text (%s). Skipping RackBrain processing."
+            % (issue_key, required_text)
+        )
+        logger = get_logger()
+        if logger:
+            logger.log_processed(
+                issue_key=issue_key,
+                success=True,
+                dry_run=dry_run,
+                actions_taken={
                     "action": "skipped_missing_required_combined_text",
                     "required_combined_text_contains": required_text,
                 },
-            }
+            )
+        return {
+            "issue_key": issue_key,
+            "match": False,
+            "rule_id": None,
+            "rule_name": None,
+            "confidence": None,
+            "edited": False,
+            "dry_run": dry_run,
+            "actions_taken": {
+                "action": "skipped_missing_required_combined_text",
+                "required_combined_text_contains": required_text,
+            },
+        }
 
     error_event = build_error_event(ticket)
 
@@ -798,31 +875,111 @@ def process_ticket(
             "(no comment, no reassign)."
         )
 
+    transitions_key = _transitions_cache_key(issue)
+    post_comment = (
+        not silent_wait and isinstance(comment_body, str) and bool(comment_body.strip())
+    )
+
+    # 1-3) Assign to myself, transition and comment in ONE transition POST.
+    # If Jira rejects it with a 400/404 (e.g. assignee not on the transition
+    # screen) nothing was changed, and the separate calls below run instead.
+    # Any other failed POST may have been applied, so nothing is sent again.
+    combined_done = False
+    combined_failed: Optional[str] = None
+    transition_not_found: Optional[str] = None
+    if transitions_key is None or transitions_key not in _COMBINED_TRANSITION_REJECTED:
+        try:
+            ok, msg = _try_transition_by_name(
+                jira,
+                issue_key,
+                transition_target,
+                comment_body=comment_body if post_comment else None,
+                assignee=MYSELF_ASSIGNEE,
+                cache_key=transitions_key,
+            )
+            if ok:
+                combined_done = True
+                print(f"[OK] Assigned {issue_key} to {MYSELF_ASSIGNEE} and transitioned to {msg}.")
+                actions_taken["assigned_to"] = MYSELF_ASSIGNEE
+                actions_taken["transitioned_to"] = msg
+                if post_comment:
+                    print(f"[OK] Comment posted to {issue_key}.")
+                    actions_taken["commented"] = True
+            else:
+                transition_not_found = msg
+        except JiraTransitionError as exc:
+            # Like _try_transition_by_name: 400/404 means Jira rejected the
+            # POST and changed nothing.
+            if exc.status_code in (400, 404):
+                if transitions_key is not None:
+                    _COMBINED_TRANSITION_REJECTED.add(transitions_key)
+                print(
+                    f"[INFO] Combined assign/transition/comment rejected for {issue_key}; "
+                    f"using separate calls: {exc}"
+                )
+            else:
+                combined_failed = f"FAILED: {exc}"
+        except Exception as exc:
+            # e.g. the transitions lookup failed; nothing was sent to Jira.
+            print(
+                f"[WARN] Combined assign/transition/comment not sent for {issue_key}; "
+                f"using separate calls: {exc}"
+            )
+
+    if combined_failed is not None:
+        print(
+            f"[WARN] Combined assign/transition/comment failed for {issue_key}; "
+            f"not retrying (it may have been applied): {combined_failed}"
+        )
+        actions_taken["assigned_to"] = combined_failed
+        actions_taken["transitioned_to"] = combined_failed
+        if post_comment:
+            actions_taken["commented"] = False
+            actions_taken["comment_error"] = combined_failed
+
     # 1) Assign to myself FIRST
-    try:
-        jira.assign_issue(issue_key, MYSELF_ASSIGNEE)
-        print(f"[OK] Assigned {issue_key} to {MYSELF_ASSIGNEE}.")
-        actions_taken["assigned_to"] = MYSELF_ASSIGNEE
-    except Exception as exc:
-        print(f"[WARN] Failed to assign {issue_key} to {MYSELF_ASSIGNEE}: {exc}")
-        actions_taken["assigned_to"] = f"FAILED: {exc}"
+    if not combined_done and combined_failed is None:
+        try:
+            jira.assign_issue(issue_key, MYSELF_ASSIGNEE)
+            print(f"[OK] Assigned {issue_key} to {MYSELF_ASSIGNEE}.")
+            actions_taken["assigned_to"] = MYSELF_ASSIGNEE
+        except Exception as exc:
+            print(f"[WARN] Failed to assign {issue_key} to {MYSELF_ASSIGNEE}: {exc}")
+            actions_taken["assigned_to"] = f"FAILED: {exc}"
 
     # 2) Transition to target (default In Progress)
-    try:
-        ok, msg = _try_transition_by_name(jira, issue_key, transition_target)
-        if ok:
-            print(f"[OK] Transitioned {issue_key} to {msg}.")
-            actions_taken["transitioned_to"] = msg
-        else:
-            print(f"[WARN] No '{transition_target}' transition found for {issue_key}.")
-            actions_taken["transitioned_to"] = msg
-    except Exception as exc:
-        print(f"[WARN] Transition to '{transition_target}' failed for {issue_key}: {exc}")
-        actions_taken["transitioned_to"] = f"FAILED: {exc}"
+    if combined_done or combined_failed is not None:
+        pass  # handled by the combined POST above
+    elif transition_not_found is not None and actions_taken.get("assigned_to") != MYSELF_ASSIGNEE:
+        # Looked up above and the assignee didn't change since; no need to
+        # ask Jira again.
+        print(f"[WARN] No '{transition_target}' transition found for {issue_key}.")
+        actions_taken["transitioned_to"] = transition_not_found
+    else:
+        # Looked up again after the assign above: workflows may only offer
+        # the transition to the assignee.
+        try:
+            ok, msg = _try_transition_by_name(
+                jira,
+                issue_key,
+                transition_target,
+                cache_key=transitions_key,
+            )
+            if ok:
+                print(f"[OK] Transitioned {issue_key} to {msg}.")
+                actions_taken["transitioned_to"] = msg
+            else:
+                print(f"[WARN] No '{transition_target}' transition found for {issue_key}.")
+                actions_taken["transitioned_to"] = msg
+        except Exception as exc:
+            print(f"[WARN] Transition to '{transition_target}' failed for {issue_key}: {exc}")
+            actions_taken["transitioned_to"] = f"FAILED: {exc}"
 
     # 3) Post comment (unless silent_wait)
     try:
-        if silent_wait:
+        if (combined_done or combined_failed is not None) and post_comment:
+            pass  # posted with the transition, or possibly posted and not resent
+        elif silent_wait:
             print(f"[INFO] Silent wait: skip commenting on {issue_key}.")
             actions_taken["commented"] = False
         else: